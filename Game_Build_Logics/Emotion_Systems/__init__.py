@@ -1,7 +1,10 @@
-from game_engine import EmotionSystem, NPCEmotion
+from game_engine import EmotionSystem, NPCEmotion, njit, NUMBA_CACHE, EMOTION_UPDATE_INTERVAL
 
 ## Emotion system choice
 class BaseEmotionSystem:
+    ## Frames between determine_emotion calls --> npc_emotion_lagged is the emotion from that many frames back
+    update_interval = EMOTION_UPDATE_INTERVAL
+    
     def __init__(self):
         pass
     
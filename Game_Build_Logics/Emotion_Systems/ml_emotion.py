@@ -3,12 +3,55 @@ import os
 import sys
 import numpy as np
 import joblib
+from concurrent.futures import ThreadPoolExecutor
 from game_engine import EmotionSystem, NPCEmotion, PlayerAction
 from emotion_systems import BaseEmotionSystem
 
-## Add XGBoost VERSION file handling
+## Optional Treelite runtime for the natively compiled model (see build.py --treelite) --> Treelite 3.x, pinned in requirements.txt
+try:
+    import treelite_runtime
+except ImportError:
+    treelite_runtime = None
+
+## File name of the compiled model library, placed next to the model file
+if sys.platform == 'win32':
+    COMPILED_MODEL_LIB = 'libmodel.dll'
+elif sys.platform == 'darwin':
+    COMPILED_MODEL_LIB = 'libmodel.dylib'
+else:
+    COMPILED_MODEL_LIB = 'libmodel.so'
+
+## Column of each one-hot dummy, keyed by enum member and by raw value --> built once at import
+## so the per-frame path needs no isinstance checks or string building
+_ACTION_COL = {PlayerAction.IDLE: 10, PlayerAction.MOVE: 11, PlayerAction.ATTACK: 12,
+               0: 10, 1: 11, 2: 12}
+_ACTION_LAG_COL = {PlayerAction.IDLE: 13, PlayerAction.MOVE: 14, PlayerAction.ATTACK: 15,
+                   0: 13, 1: 14, 2: 15}
+_EMO_COL = {}
+for _col, _emotion in enumerate(NPCEmotion, start=16):
+    _EMO_COL[_emotion] = _col
+    _EMO_COL[_emotion.value] = _col
+
+## Emotion for each class index predicted by the model
+_IDX_TO_EMO = (
+    NPCEmotion.ANTICIPATION,
+    NPCEmotion.HAPPINESS,
+    NPCEmotion.FEAR,
+    NPCEmotion.ANGER,
+    NPCEmotion.SURPRISE,
+    NPCEmotion.SADNESS
+)
+
+## Add XGBoost VERSION file handling --> the check only needs to run once per process
+_VERSION_FIXED = False
+
 def fix_xgboost_version():
     ## Create the VERSION file if it's missing
+    global _VERSION_FIXED
+    if _VERSION_FIXED:
+        return False
+    _VERSION_FIXED = True
+    
     try:
         ## Get the XGBoost directory in the temp folder or the current directory
         base_dir = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
@@ -29,63 +72,170 @@ def fix_xgboost_version():
 ## Try to fix XGBoost VERSION file
 fix_xgboost_version()
 
+## XGBoost is imported after the VERSION fix --> needed to load the native booster format
+try:
+    import xgboost as xgb
+except Exception:
+    xgb = None
+
+## Native XGBoost model saved next to the pickle by build.py, loaded without joblib/sklearn
+NATIVE_MODEL_EXT = '.ubj'
+
 ## Create emotion class prediction
 class MLEmotionSystem(BaseEmotionSystem):
     def __init__(self, model_path='model/game_npc_model.pkl'):
         super().__init__()
         self.model = None
         self.model_path = model_path
-        self.model_loaded = False
-        
-        ## Dictionary to map emotion indices to emotion enum
-        self.index_to_emotion = {
-            0: NPCEmotion.ANTICIPATION,
-            1: NPCEmotion.HAPPINESS,
-            2: NPCEmotion.FEAR,
-            3: NPCEmotion.ANGER,
-            4: NPCEmotion.SURPRISE,
-            5: NPCEmotion.SADNESS
-        }
+        self._model_loaded = False
+        self._model_file = None
+        self._load_future = None
+        self._load_failed = False
+        self._booster = None
+        self._predictor = None
+        
+        ## Memoized predictions keyed on the exact game state --> a hit returns what the model said for that state
+        self._prediction_cache = {}
+        self._prediction_cache_size = 4096
+        
+        ## Preallocated feature row reused on every prediction (22 model features)
+        self._feat = np.zeros((1, 22), dtype=np.float32)
+        
+        ## Last predicted row and emotion --> a new row within _feat_tol of the last one reuses the last emotion
+        ## (zero tolerance by default, so only an identical row skips the model)
+        self._last_feat = np.full(22, np.nan, dtype=np.float32)
+        self._last_emotion = None
+        self._feat_tol = np.zeros(22, dtype=np.float32)
+        
+        ## Scatter indices/values for write_features --> 10 numeric columns then 3 one-hot columns
+        self._put_idx = np.arange(13, dtype=np.intp)
+        self._put_vals = np.ones(13, dtype=np.float32)
+    
+    @property
+    def model_loaded(self):
+        ## Poll the background load and finish setting up the model once it is done
+        if not self._model_loaded and not self._load_failed and self._load_future is not None and self._load_future.done():
+            self._finish_model_load()
+        return self._model_loaded
+    
+    @model_loaded.setter
+    def model_loaded(self, value):
+        self._model_loaded = value
     
     def initialize(self, game_instance):
         super().initialize(game_instance)
         
+        ## The instance is shared across games --> nothing predicted in an earlier game carries over
+        self._last_feat.fill(np.nan)
+        self._last_emotion = None
+        self._prediction_cache.clear()
+        
+        ## The model is kept across game resets --> only load it once
+        if self._model_loaded or self._load_future is not None:
+            return
+        
         try:
-            ## Find and load the pre-trained model
-            if not os.path.isabs(self.model_path):
-                ## Try relative paths
-                base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-                possible_paths = [
-                    self.model_path,
-                    os.path.join(base_dir, self.model_path),
-                    os.path.join(base_dir, 'model', os.path.basename(self.model_path)),
-                    os.path.join(os.path.dirname(base_dir), self.model_path)
-                ]
-                
-                for path in possible_paths:
-                    if os.path.exists(path):
-                        print(f"Found model at {path}")
-                        fix_xgboost_version()
-                        self.model = joblib.load(path)
-                        self.model_loaded = True
-                        print(f"Successfully loaded the trained model from {path}")
-                        break
-            else:
-                ## Use absolute path
-                if os.path.exists(self.model_path):
-                    fix_xgboost_version()
-                    self.model = joblib.load(self.model_path)
-                    self.model_loaded = True
-                    print(f"Successfully loaded the trained model from {self.model_path}")
+            ## Find the pre-trained model --> first candidate that can be opened wins
+            model_file = None
+            for path in self._candidate_model_paths():
+                try:
+                    open(path, 'rb').close()
+                except OSError:
+                    continue
+                print(f"Found model at {path}")
+                model_file = path
+                break
             
-            if not self.model_loaded:
+            if model_file is None:
                 print(f"WARNING: Could not find model at {self.model_path}")
-                print(f"Attempted paths: {possible_paths}")
+                print(f"Attempted paths: {list(self._candidate_model_paths())}")
                 print(f"ML-based NPC emotions will fall back to rule-based logic")
+                return
+            
+            ## Load the model in the background --> rule-based fallback is used until it is ready
+            self._model_file = model_file
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._load_future = executor.submit(self._load_model, model_file)
+            executor.shutdown(wait=False)
         except Exception as e:
             print(f"WARNING: Could not load model: {e}")
             print(f" ML-based NPC emotions will fall back to rule-based logic")
     
+    def _candidate_model_paths(self):
+        ## Each model location, preferring the native booster file over the pickle
+        for path in self._model_locations():
+            if xgb is not None:
+                yield os.path.splitext(path)[0] + NATIVE_MODEL_EXT
+            yield path
+    
+    def _model_locations(self):
+        ## Model locations in priority order --> an absolute path is the only candidate
+        yield self.model_path
+        if os.path.isabs(self.model_path):
+            return
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        yield os.path.join(base_dir, self.model_path)
+        yield os.path.join(base_dir, 'model', os.path.basename(self.model_path))
+        yield os.path.join(os.path.dirname(base_dir), self.model_path)
+    
+    def _load_model(self, path):
+        ## Runs on the loader thread --> the XGBoost VERSION fix already ran at import time
+        if path.endswith(NATIVE_MODEL_EXT):
+            booster = xgb.Booster()
+            booster.load_model(path)
+            return booster
+        return joblib.load(path)
+    
+    def _finish_model_load(self):
+        ## Take over the model loaded in the background
+        try:
+            self.model = self._load_future.result()
+        except Exception as e:
+            ## Report the failure once --> the fallback logic is used from now on
+            self._load_failed = True
+            print(f"WARNING: Could not load model: {e}")
+            print(f" ML-based NPC emotions will fall back to rule-based logic")
+            return
+        
+        ## Cache the underlying booster so predictions can skip the DMatrix construction
+        if xgb is not None and isinstance(self.model, xgb.Booster):
+            self._booster = self.model
+        else:
+            try:
+                self._booster = self.model.get_booster()
+            except Exception as e:
+                print(f"Note: Booster not available, using model.predict: {e}")
+                self._booster = None
+        
+        ## Single-row predictions do not benefit from extra OpenMP threads
+        if self._booster is not None:
+            try:
+                self._booster.set_param({'nthread': 1})
+            except Exception as e:
+                print(f"Note: Could not set booster threads: {e}")
+        
+        self.load_compiled_model(os.path.dirname(self._model_file))
+        self._model_loaded = True
+        print(f"Successfully loaded the trained model from {self._model_file}")
+    
+    def load_compiled_model(self, model_dir):
+        ## Load the Treelite-compiled model if both the runtime and the library are available
+        if treelite_runtime is None:
+            return False
+        
+        lib_path = os.path.join(model_dir, COMPILED_MODEL_LIB)
+        if not os.path.exists(lib_path):
+            return False
+        
+        try:
+            self._predictor = treelite_runtime.Predictor(lib_path)
+            print(f"Loaded compiled model from {lib_path}")
+            return True
+        except Exception as e:
+            print(f"Note: Could not load compiled model, using XGBoost: {e}")
+            self._predictor = None
+            return False
+    
     def determine_emotion(self, player_health, enemy_proximity, resource_proximity,
                          lagged_player_action, level, player_x, player_y, npc_x, npc_y,
                          resources_collected, enemies_killed, npc_emotion_lagged, current_player_action):
@@ -94,124 +244,111 @@ class MLEmotionSystem(BaseEmotionSystem):
         ## If model isn't loaded, fall back to the current emotion
         if not self.model_loaded or self.model is None:
             ## Fall back to rule-based emotion logic in this case --> should not happen but just in case
-            emotion = NPCEmotion.ANTICIPATION
+            ## Conditions are checked from highest to lowest priority so the first match wins
+            dx = player_x - npc_x
+            dy = player_y - npc_y
             
-            ## Resource nearby - be happy
-            if resource_proximity < 150:
-                emotion = NPCEmotion.HAPPINESS
+            ## If player health is low - be sad
+            if player_health <= 30:
+                return NPCEmotion.SADNESS
             
-            ## Enemy at medium distance - be fearful
-            if enemy_proximity < 125:
-                emotion = NPCEmotion.FEAR
+            ## If player attacks near NPC - be surprised (squared distance, 60**2)
+            elif current_player_action is PlayerAction.ATTACK and dx * dx + dy * dy < 3600:
+                return NPCEmotion.SURPRISE
             
             ## Enemy is very close - be angry
-            if enemy_proximity < 60:
-                emotion = NPCEmotion.ANGER
+            elif enemy_proximity < 60:
+                return NPCEmotion.ANGER
             
-            ## If player attacks near NPC - be surprised
-            if (current_player_action == PlayerAction.ATTACK and 
-                ((player_x - npc_x)**2 + (player_y - npc_y)**2)**0.5 < 60):
-                emotion = NPCEmotion.SURPRISE
+            ## Enemy at medium distance - be fearful
+            elif enemy_proximity < 125:
+                return NPCEmotion.FEAR
             
-            ## If player health is low - be sad
-            if player_health <= 30:
-                emotion = NPCEmotion.SADNESS
+            ## Resource nearby - be happy
+            elif resource_proximity < 150:
+                return NPCEmotion.HAPPINESS
             
+            return NPCEmotion.ANTICIPATION
+        
+        ## Reuse the prediction for an identical state
+        key = (player_x, player_y, npc_x, npc_y, player_health, enemy_proximity, resource_proximity,
+               resources_collected, enemies_killed, level, lagged_player_action, npc_emotion_lagged, current_player_action)
+        emotion = self._prediction_cache.get(key)
+        if emotion is not None:
             return emotion
         
         try:
-            ## Convert action enum to string with _lagged suffix
-            if isinstance(lagged_player_action, PlayerAction):
-                action_str = lagged_player_action.value + "_lagged"
-            else:
-                # If it's already a value, map it back
-                action_map = {0: "idle", 1: "move", 2: "attack"}
-                action_str = action_map.get(lagged_player_action, "idle") + "_lagged"
-            
-            ## Convert current player action to string
-            if isinstance(current_player_action, PlayerAction):
-                current_action_str = current_player_action.value
-            else:
-                current_action_str = action_map.get(current_player_action, "idle")
-            
-            ## Convert NPC emotion_lagged to string
-            if isinstance(npc_emotion_lagged, NPCEmotion):
-                emotion_lagged_str = npc_emotion_lagged.value
-            else:
-                # If it's already a string
-                emotion_lagged_str = npc_emotion_lagged
-            
-            ## Create a feature dictionary with all expected features set to 0
-            feature_dict = {
-                'Player_x': player_x,
-                'Player_y': player_y,
-                'NPC_x': npc_x,
-                'NPC_y': npc_y,
-                'Player_health': player_health,
-                'Enemy_proximity': enemy_proximity,
-                'Resource_proximity': resource_proximity,
-                'resources_collected': resources_collected,
-                'enemies_killed': enemies_killed,
-                'level': level,
-                'idle': 0,
-                'move': 0,
-                'attack': 0,
-                'idle_lagged': 0,
-                'move_lagged': 0,
-                'attack_lagged': 0,
-                'anticipation': 0,
-                'happiness': 0,
-                'fear': 0,
-                'anger': 0,
-                'surprise': 0,
-                'sadness': 0
-            }
-            
-            ## Set the appropriate dummies to 1
-            ## Current player action
-            feature_dict[current_action_str] = 1
-            
-            ## Set lagged player action
-            feature_dict[action_str] = 1
+            ## Fill the preallocated (1, 22) row and predict on it
+            self.write_features(self._feat[0], player_health, enemy_proximity, resource_proximity,
+                                lagged_player_action, level, player_x, player_y, npc_x, npc_y,
+                                resources_collected, enemies_killed, npc_emotion_lagged, current_player_action)
             
-            ## Set lagged NPC emotion
-            feature_dict[emotion_lagged_str] = 1
+            ## Skip the model when the state has not moved since the last prediction
+            row = self._feat[0]
+            if self._last_emotion is not None and np.all(np.abs(row - self._last_feat) <= self._feat_tol):
+                return self._last_emotion
             
-            ## Convert to list in a consistent order
-            features = np.array([[
-                feature_dict['Player_x'],
-                feature_dict['Player_y'],
-                feature_dict['NPC_x'],
-                feature_dict['NPC_y'],
-                feature_dict['Player_health'],
-                feature_dict['Enemy_proximity'],
-                feature_dict['Resource_proximity'],
-                feature_dict['resources_collected'],
-                feature_dict['enemies_killed'],
-                feature_dict['level'],
-                feature_dict['idle'],
-                feature_dict['move'],
-                feature_dict['attack'],
-                feature_dict['idle_lagged'],
-                feature_dict['move_lagged'],
-                feature_dict['attack_lagged'],
-                feature_dict['anticipation'],
-                feature_dict['happiness'],
-                feature_dict['fear'],
-                feature_dict['anger'],
-                feature_dict['surprise'],
-                feature_dict['sadness']
-            ]])
+            prediction = self.predict_labels(self._feat)[0]
+            emotion = _IDX_TO_EMO[int(prediction)]
+            self._last_feat[:] = row
+            self._last_emotion = emotion
             
-            ## Predict using the model
-            prediction = self.model.predict(features)[0]
-            return self.index_to_emotion[prediction]
+            ## Keep the cache bounded by starting over once it is full
+            if len(self._prediction_cache) >= self._prediction_cache_size:
+                self._prediction_cache.clear()
+            self._prediction_cache[key] = emotion
+            return emotion
         
         except Exception as e:
             print(f"Model prediction error: {e}")
             ## Just maintain current emotion on error
             return npc_emotion_lagged
+    
+    def write_features(self, row, player_health, enemy_proximity, resource_proximity,
+                       lagged_player_action, level, player_x, player_y, npc_x, npc_y,
+                       resources_collected, enemies_killed, npc_emotion_lagged, current_player_action):
+        ## Write one game state into a 22-wide feature row, in model order
+        ## Reset the dummies, then scatter the 10 numeric features and the three one-hot
+        ## columns in a single put (unknown actions count as idle)
+        row[10:22] = 0
+        idx = self._put_idx
+        idx[10] = _ACTION_COL.get(current_player_action, 10)
+        idx[11] = _ACTION_LAG_COL.get(lagged_player_action, 13)
+        idx[12] = _EMO_COL[npc_emotion_lagged]
+        vals = self._put_vals
+        vals[:10] = (player_x, player_y, npc_x, npc_y, player_health, enemy_proximity,
+                     resource_proximity, resources_collected, enemies_killed, level)
+        row.put(idx, vals)
+    
+    def predict_labels(self, feat):
+        ## Predict emotion indices for an (N, 22) feature matrix
+        ## Predict with the compiled model when available
+        if self._predictor is not None:
+            try:
+                return self._to_labels(self._predictor.predict(treelite_runtime.DMatrix(feat)))
+            except Exception as e:
+                print(f"Note: Compiled model prediction failed, using XGBoost: {e}")
+                self._predictor = None
         
+        ## Predict using the booster in place, falling back to the sklearn wrapper
+        if self._booster is not None:
+            try:
+                return self._to_labels(self._booster.inplace_predict(feat))
+            except Exception as e:
+                print(f"Note: inplace_predict failed, using model.predict: {e}")
+                self._booster = None
+        
+        ## A native booster has no sklearn wrapper to fall back to and needs a DMatrix
+        if xgb is not None and isinstance(self.model, xgb.Booster):
+            return self._to_labels(self.model.predict(xgb.DMatrix(feat)))
+        return np.asarray(self.model.predict(feat), dtype=np.intp)
+    
+    def _to_labels(self, pred):
+        ## softmax models return the class, softprob models return per-class probabilities
+        if pred.ndim == 1:
+            return pred.astype(np.intp)
+        return pred.argmax(axis=1)
+    
     def get_system_type(self):
         ## Return the type of emotion system
         return EmotionSystem.MACHINE_LEARNING
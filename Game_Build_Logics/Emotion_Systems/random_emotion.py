@@ -5,10 +5,17 @@ from emotion_systems import BaseEmotionSystem
 
 ## Renadom Condition class
 class RandomEmotionSystem(BaseEmotionSystem):
+    ## Called every frame --> the cooldown below counts frames
+    update_interval = 1
+    
     def __init__(self):
         super().__init__()
         self.emotion_change_cooldown = 0
-        self.emotion_change_interval = 35  ## Change emotion every ~2 seconds
+        self.emotion_change_interval = 35  ## Change emotion every ~1 second (35 frames at 30 FPS)
+        
+        ## Emotions to pick from, converted once instead of on every change
+        self._emos = tuple(NPCEmotion)
+        self._n = len(self._emos)
     
     def initialize(self, game_instance):
         super().initialize(game_instance)
@@ -21,11 +28,17 @@ class RandomEmotionSystem(BaseEmotionSystem):
         self.emotion_change_cooldown -= 1
         if self.emotion_change_cooldown <= 0:
             ## Randomly select a new emotion
-            emotion_list = list(NPCEmotion)
-            new_emotion = random.choice(emotion_list)
+            ## Draw 3 random bits and redraw when out of range so every emotion stays equally likely
+            index = random.getrandbits(3)
+            while index >= self._n:
+                index = random.getrandbits(3)
+            new_emotion = self._emos[index]
             
-            ## Reset cooldown with some randomness
-            self.emotion_change_cooldown = self.emotion_change_interval + random.randint(-15, 15)
+            ## Reset cooldown with some randomness --> uniform in [-15, 15] from 5 bits
+            jitter = random.getrandbits(5)
+            while jitter > 30:
+                jitter = random.getrandbits(5)
+            self.emotion_change_cooldown = self.emotion_change_interval + jitter - 15
             return new_emotion
         else:
             # Keep the current emotion
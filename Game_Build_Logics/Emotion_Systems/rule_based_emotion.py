@@ -1,6 +1,47 @@
 ## Rule-based Codnition
+from functools import lru_cache
 from game_engine import EmotionSystem, NPCEmotion, PlayerAction
-from emotion_systems import BaseEmotionSystem
+from emotion_systems import BaseEmotionSystem, njit, NUMBA_CACHE
+
+## Emotion for each index returned by the rule kernel
+_IDX_TO_EMO = (
+    NPCEmotion.ANTICIPATION,
+    NPCEmotion.HAPPINESS,
+    NPCEmotion.FEAR,
+    NPCEmotion.ANGER,
+    NPCEmotion.SURPRISE,
+    NPCEmotion.SADNESS
+)
+
+## Emotion index for each 5-bit rule mask --> the highest set bit has priority, so the
+## index is the bit length (bit 0 happiness ... bit 4 sadness, no bit set anticipation)
+_LUT = tuple(mask.bit_length() for mask in range(32))
+
+## Rule kernel returning the emotion index (order of _IDX_TO_EMO) --> the explicit signature
+## compiles it at import (cached on disk outside frozen builds), so the first frame does not pay for it
+@njit("intp(float64, float64, float64, float64, float64, float64, float64, boolean)", cache=NUMBA_CACHE, fastmath=True)
+def _rule(player_health, enemy_proximity, resource_proximity,
+          player_x, player_y, npc_x, npc_y, current_action_is_attack):
+    dx = player_x - npc_x
+    dy = player_y - npc_y
+    
+    ## One bit per rule, in increasing priority:
+    ## resource nearby - be happy, enemy at medium distance - be fearful,
+    ## enemy in attack range - be angry, player attacks near NPC (squared distance, 60**2) - be surprised,
+    ## player health is low - be sad
+    mask = ((resource_proximity < 150)
+            | ((enemy_proximity < 125) << 1)
+            | ((enemy_proximity < 60) << 2)
+            | ((current_action_is_attack and dx * dx + dy * dy < 3600) << 3)
+            | ((player_health <= 30) << 4))
+    return _LUT[mask]
+
+## Memoized rules on a quantized state --> the 5 pixel / 5 health buckets line up with
+## every threshold above, so the cached result is the same as evaluating _rule directly
+@lru_cache(maxsize=4096)
+def _rule_cached(health_bucket, enemy_bucket, resource_bucket, attack_near):
+    return _rule(health_bucket * 5.0, enemy_bucket * 5.0, resource_bucket * 5.0,
+                 0.0, 0.0, 0.0, 0.0, attack_near)
 
 ## Rule-based Condition class
 class RuleBasedEmotionSystem(BaseEmotionSystem):
@@ -10,32 +51,16 @@ class RuleBasedEmotionSystem(BaseEmotionSystem):
     def determine_emotion(self, player_health, enemy_proximity, resource_proximity,
                          lagged_player_action, level, player_x, player_y, npc_x, npc_y,
                          resources_collected, enemies_killed, npc_emotion_lagged, current_player_action):
-       ## Rule-based emotion logic:
-        ## Default emotion - will be overridden by conditions
-        emotion = NPCEmotion.ANTICIPATION
-        
-        ## Resource nearby - be happy
-        if resource_proximity < 150:
-            emotion = NPCEmotion.HAPPINESS
+        ## Rule-based emotion logic, looked up on the quantized state
+        dx = player_x - npc_x
+        dy = player_y - npc_y
+        attack_near = current_player_action is PlayerAction.ATTACK and dx * dx + dy * dy < 3600
         
-        ## Enemy at medium distance - be fearful
-        if enemy_proximity < 125:
-            emotion = NPCEmotion.FEAR
-        
-        ## Check if any enemy is in attack range of player - be angry
-        if enemy_proximity < 60:
-            emotion = NPCEmotion.ANGER
-        
-        ## If player attacks near NPC - be surprised
-        if (current_player_action == PlayerAction.ATTACK and 
-            ((player_x - npc_x)**2 + (player_y - npc_y)**2)**0.5 < 60):
-            emotion = NPCEmotion.SURPRISE
-        
-        ## If player health is low - be sad
-        if player_health <= 30:
-            emotion = NPCEmotion.SADNESS
-        
-        return emotion
+        ## Health rounds up and proximities round down (capped at the 1000 "none in room" value)
+        health_bucket = -int(-player_health // 5)
+        enemy_bucket = int(min(enemy_proximity, 1000) // 5)
+        resource_bucket = int(min(resource_proximity, 1000) // 5)
+        return _IDX_TO_EMO[_rule_cached(health_bucket, enemy_bucket, resource_bucket, attack_near)]
     
     def get_system_type(self):
         # Return the type of emotion system
@@ -43,4 +68,3 @@ class RuleBasedEmotionSystem(BaseEmotionSystem):
 
     def get_description(self):
         return "You are accompanied by an NPC companion."
-
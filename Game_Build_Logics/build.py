@@ -122,6 +122,56 @@ def fix_xgboost_version():
     print(f"Created XGBoost VERSION fix script at: {script_path}")
     return script_path
 
+## Save the booster in XGBoost's native format so the game can load it without joblib
+def export_native_model(model_file):
+    """Write the model's booster as UBJSON next to the pickle"""
+    if not os.path.exists(model_file):
+        return None
+    
+    import joblib
+    
+    native_file = os.path.splitext(model_file)[0] + '.ubj'
+    try:
+        joblib.load(model_file).get_booster().save_model(native_file)
+        print(f"Exported native XGBoost model at: {native_file}")
+        return native_file
+    except Exception as e:
+        print(f"Warning: Could not export native model, the game will load the pickle: {e}")
+        return None
+
+## Compile the trained model to a native library with Treelite for faster single-row prediction
+## --> Treelite 3.x API (Model.export_lib + treelite_runtime), removed in Treelite 4, hence the pin in requirements.txt
+def compile_treelite_model(model_file, model_dir):
+    """Compile the XGBoost model into a shared library next to the model file"""
+    if importlib.util.find_spec("treelite") is None:
+        print("Treelite is not installed. Please install it with: pip install treelite==3.9.1 treelite_runtime==3.9.1")
+        return None
+    
+    if not os.path.exists(model_file):
+        print("Warning: Model file not found, skipping Treelite compilation.")
+        return None
+    
+    import joblib
+    import treelite
+    
+    if platform.system() == 'Windows':
+        lib_name, toolchain = 'libmodel.dll', 'msvc'
+    elif platform.system() == 'Darwin':
+        lib_name, toolchain = 'libmodel.dylib', 'clang'
+    else:
+        lib_name, toolchain = 'libmodel.so', 'gcc'
+    lib_path = os.path.join(model_dir, lib_name)
+    
+    try:
+        booster = joblib.load(model_file).get_booster()
+        model = treelite.Model.from_xgboost(booster)
+        model.export_lib(toolchain=toolchain, libpath=lib_path, params={'parallel_comp': 1})
+        print(f"Compiled Treelite model library at: {lib_path}")
+        return lib_path
+    except Exception as e:
+        print(f"Warning: Treelite compilation failed, the game will use XGBoost directly: {e}")
+        return None
+
 def main():
     ## Parse command line arguments
     parser = argparse.ArgumentParser(description="Build the NPC Emotion Game executable")
@@ -129,6 +179,7 @@ def main():
     parser.add_argument('--onefile', action='store_true', help='Create a single executable file')
     parser.add_argument('--noconfirm', action='store_true', help='Replace output directory without asking')
     parser.add_argument('--debug', action='store_true', help='Include debug information in the build')
+    parser.add_argument('--treelite', action='store_true', help='Compile the model to a native library with Treelite')
     args = parser.parse_args()
 
     ## Define build directories
@@ -156,6 +207,13 @@ def main():
         print("Warning: Model file not found. The ML condition will fall back to rule-based behavior.")
         print(f"Expected location: {model_file}")
     
+    ## Export the native booster --> bundled through the model directory
+    export_native_model(model_file)
+    
+    ## Compile the model with Treelite if requested --> bundled through the model directory
+    if args.treelite:
+        compile_treelite_model(model_file, model_dir)
+    
     ## Create data directory if it doesn't exist
     data_dir = os.path.join(base_dir, 'data')
     if not os.path.exists(data_dir):
@@ -219,6 +277,7 @@ def main():
         '--hidden-import=scipy',
         '--hidden-import=numpy',
         '--hidden-import=joblib',
+        '--hidden-import=numba',
         '--hidden-import=scipy.sparse._csr',
         '--hidden-import=scipy.sparse._csc',
         '--hidden-import=scipy.sparse._coo',
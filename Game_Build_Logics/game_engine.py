@@ -2,7 +2,28 @@
 import random
 import math
 import os
+import sys
+import gc
 from enum import Enum
+from collections import defaultdict, deque, OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+
+## Numba is optional --> without it the jitted kernels run as plain Python
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+## Numba's on-disk cache needs the .py source next to the kernels --> a frozen (PyInstaller) build has none,
+## so the kernels are compiled in memory there instead of failing with "no locator available"
+NUMBA_CACHE = not getattr(sys, "frozen", False)
 
 # *** IMPORTANT: Don't initialize Pygame at import time on macOS ***
 # pygame will be imported and initialized only when needed
@@ -16,6 +37,21 @@ ENEMY_SIZE = 30
 RESOURCE_SIZE = 24
 OBSTACLE_SIZE = 40
 FPS = 30
+EMOTION_UPDATE_INTERVAL = 3  ## default frames between NPC emotion updates
+DEBUG_LOG_SIZE = 1024  ## debug messages kept between flushes, oldest dropped first
+DEBUG_LOG_FLUSH_MS = 1000  ## debug messages are written out at most once per second
+RECT_POOL_SIZE = 16  ## scratch Rects reused for per-frame text placement
+GC_INTERVAL_MS = 5000  ## the cyclic garbage collector only runs at this interval while the game loop is active
+
+## HUD text positions (top-left) --> fixed, so they are built once instead of in every frame
+HUD_HEALTH_POS = (25, 25)
+HUD_ROOM_POS = (WIDTH - 120, 25)
+HUD_DOOR_POS = (WIDTH // 2 - 40, 25)
+HUD_RESOURCES_POS = (WIDTH - 200, 60)
+HUD_ENEMIES_POS = (WIDTH - 200, 85)
+HUD_TIMER_POS = (WIDTH - 120, 115)
+HUD_EMOTION_POS = (25, 120)
+HUD_REACTION_POS = (25, 145)
 
 ## Color setting
 WHITE = (255, 255, 255)
@@ -51,6 +87,11 @@ NOTIFY_RADIUS = 150
 ENEMY_DETECTION_RADIUS = 250
 ATTACK_RADIUS = 60
 
+## Squared radii --> proximity checks compare squared distances and skip the sqrt
+ENEMY_DETECTION_RADIUS_SQ = ENEMY_DETECTION_RADIUS ** 2
+ATTACK_RADIUS_SQ = ATTACK_RADIUS ** 2
+OBSTACLE_SIZE_SQ = OBSTACLE_SIZE ** 2
+
 ## Player and NPC combat stats
 PLAYER_DAMAGE = 100
 NPC_DAMAGE = 20
@@ -64,6 +105,12 @@ ENEMY_SPEED = 1.5
 MIN_OBSTACLES = 3
 MAX_OBSTACLES = 8
 
+## Cell size of the obstacle spatial hash --> larger than any collision radius, so a 3x3 query is enough
+OBSTACLE_CELL = OBSTACLE_SIZE * 2
+
+## Cell size of the per-tick enemy spatial hash
+ENEMY_CELL = ATTACK_RADIUS * 2
+
 ## Class Enums
 class PlayerAction(Enum):
     IDLE = "idle"
@@ -86,6 +133,75 @@ class NPCReaction(Enum):
     NOTIFY_SURPRISE = "notify_surprise"
     PROVIDE_HEALING = "provide_healing"
 
+## Player and NPC state --> slotted dataclasses give fixed-offset attribute access instead of dict lookups
+@dataclass(slots=True)
+class PlayerState:
+    x: float
+    y: float
+    health: float = 100
+    action: PlayerAction = PlayerAction.IDLE
+    speed: float = PLAYER_SPEED
+    resources_collected: int = 0
+    enemies_killed: int = 0
+
+@dataclass(slots=True)
+class NPCState:
+    x: float
+    y: float
+    emotion: NPCEmotion = NPCEmotion.ANTICIPATION
+    emotion_lagged: NPCEmotion = NPCEmotion.ANTICIPATION
+    reaction: NPCReaction = NPCReaction.FOLLOW
+    speed: float = NPC_SPEED
+    attack_cooldown: int = 0
+
+## NPC reaction for each emotion
+REACTION_MAP = {
+    NPCEmotion.ANTICIPATION: NPCReaction.FOLLOW,
+    NPCEmotion.HAPPINESS: NPCReaction.NOTIFY_RESOURCE,
+    NPCEmotion.FEAR: NPCReaction.NOTIFY_DANGER,
+    NPCEmotion.ANGER: NPCReaction.ATTACK_ENEMY,
+    NPCEmotion.SURPRISE: NPCReaction.NOTIFY_SURPRISE,
+    NPCEmotion.SADNESS: NPCReaction.PROVIDE_HEALING
+}
+
+## Emotion bubble symbols and colours
+EMOTION_SYMBOLS = {
+    NPCEmotion.ANTICIPATION: "...",
+    NPCEmotion.HAPPINESS: ":)",
+    NPCEmotion.FEAR: "!!",
+    NPCEmotion.ANGER: "!!",
+    NPCEmotion.SURPRISE: "?!",
+    NPCEmotion.SADNESS: ":("
+}
+
+## The ML condition keeps the standard symbols in room 1 and uses its own set in room 2
+ML_ROOM_EMOTION_SYMBOLS = {
+    1: EMOTION_SYMBOLS,
+    2: {
+        NPCEmotion.ANTICIPATION: "..?",
+        NPCEmotion.HAPPINESS: ":D",
+        NPCEmotion.FEAR: "??",
+        NPCEmotion.ANGER: ">:(",
+        NPCEmotion.SURPRISE: ":O",
+        NPCEmotion.SADNESS: ":'("
+    }
+}
+
+EMOTION_COLORS = {
+    NPCEmotion.ANTICIPATION: PIXEL_YELLOW,
+    NPCEmotion.HAPPINESS: PIXEL_GREEN,
+    NPCEmotion.FEAR: WHITE,
+    NPCEmotion.ANGER: PIXEL_RED,
+    NPCEmotion.SURPRISE: PIXEL_PURPLE,
+    NPCEmotion.SADNESS: PIXEL_BLUE
+}
+
+## Semi-transparent green of the unlocked door's pulse
+DOOR_GLOW_COLOR = (PIXEL_GREEN[0], PIXEL_GREEN[1], PIXEL_GREEN[2], 150)
+
+## Player step (dx, dy) for each movement key combination --> index bits: up=1, down=2, left=4, right=8
+MOVE_TABLE = tuple(((bits >> 3 & 1) - (bits >> 2 & 1), (bits >> 1 & 1) - (bits & 1)) for bits in range(16))
+
 class GameState(Enum):
     START_SCREEN = "start_screen"
     PLAYING = "playing"
@@ -96,7 +212,181 @@ class EmotionSystem(Enum):
     RULE_BASED = "rule_based"
     MACHINE_LEARNING = "machine_learning"
 
+## Helper function for nearest-entity queries
+def _grid_nearest(grid, count, xs, ys, cell_size, px, py):
+    ## (index, squared distance) of the entity closest to (px, py) in a {cell: [indices]} grid, (None, None) if it is empty
+    ## --> walks rings of cells outward and stops once no farther ring can hold a closer entity
+    remaining = count
+    cell_x, cell_y = int(px // cell_size), int(py // cell_size)
+    nearest, nearest_sq = None, None
+    ring = 0
+    
+    while remaining > 0:
+        if nearest is not None and ((ring - 1) * cell_size)**2 > nearest_sq:
+            break
+        for gx in range(cell_x - ring, cell_x + ring + 1):
+            ## Whole column on the ring's left/right edges, only top and bottom cells in between
+            step = 1 if gx == cell_x - ring or gx == cell_x + ring else 2 * ring
+            for gy in range(cell_y - ring, cell_y + ring + 1, step):
+                for i in grid.get((gx, gy), ()):
+                    remaining -= 1
+                    d2 = (xs[i] - px)**2 + (ys[i] - py)**2
+                    if nearest is None or d2 < nearest_sq or (d2 == nearest_sq and i < nearest):
+                        nearest, nearest_sq = i, d2
+        ring += 1
+    
+    return nearest, nearest_sq
+
+## Unit direction table for the enemies' random escape move --> a lookup replaces the cos/sin calls
+SINCOS_LUT_SIZE = 256
+_lut_angles = np.arange(SINCOS_LUT_SIZE) * (2 * math.pi / SINCOS_LUT_SIZE)
+_SINCOS_LUT = np.stack([np.cos(_lut_angles), np.sin(_lut_angles)], axis=1)
+
+## Jitted enemy update --> enemy state lives in flat NumPy arrays, so the whole loop runs natively
+@njit(cache=NUMBA_CACHE)
+def _hits_obstacle(x, y, r2, obstacle_xy):
+    for j in range(obstacle_xy.shape[0]):
+        dx = x - obstacle_xy[j, 0]
+        dy = y - obstacle_xy[j, 1]
+        if dx * dx + dy * dy < r2:
+            return True
+    return False
+
+@njit(cache=NUMBA_CACHE)
+def _cell_empty(obstacle_cells, x, y):
+    ## No obstacle lies in the 3x3 cell window around (x, y) --> the position cannot collide
+    ## (the grid is padded by one cell, so cell -1 sits at index 0 instead of wrapping around)
+    return not obstacle_cells[int(x // OBSTACLE_CELL) + 1, int(y // OBSTACLE_CELL) + 1]
+
+@njit(cache=NUMBA_CACHE)
+def _update_enemies_numba(enemy_x, enemy_y, enemy_speed, active, jitter, obstacle_xy, obstacle_cells, px, py, min_x, max_x, min_y, max_y):
+    ## Moves the active enemies in place and returns how many of them are close enough to hit the player
+    r2 = ((OBSTACLE_SIZE + ENEMY_SIZE) * 0.5)**2
+    n = active.shape[0]
+    old_x = np.empty(n)
+    old_y = np.empty(n)
+    
+    ## Apply the pre-drawn random movement
+    for k in range(n):
+        i = active[k]
+        old_x[k] = enemy_x[i]
+        old_y[k] = enemy_y[i]
+        enemy_x[i] += jitter[k, 0]
+        enemy_y[i] += jitter[k, 1]
+    
+    hits = 0
+    for k in range(n):
+        i = active[k]
+        speed = enemy_speed[i]
+        dx = px - enemy_x[i]
+        dy = py - enemy_y[i]
+        distance_sq = dx * dx + dy * dy
+        
+        ## enemies chase player if within detection radius
+        if 0 < distance_sq < ENEMY_DETECTION_RADIUS_SQ:
+            distance = np.sqrt(distance_sq)
+            dx /= distance
+            dy /= distance
+            
+            ## Try direct movement first --> away from obstacles it is taken without any validity check
+            new_x = enemy_x[i] + dx * speed
+            new_y = enemy_y[i] + dy * speed
+            if _cell_empty(obstacle_cells, new_x, new_y):
+                enemy_x[i] = new_x
+                enemy_y[i] = new_y
+            else:
+                ## Then horizontal only, then vertical only
+                if _hits_obstacle(new_x, new_y, r2, obstacle_xy):
+                    new_y = enemy_y[i]
+                    if _hits_obstacle(new_x, new_y, r2, obstacle_xy):
+                        new_x = enemy_x[i]
+                        new_y = enemy_y[i] + dy * speed
+                        
+                        ## If still blocked, try a random direction to avoid getting stuck
+                        if _hits_obstacle(new_x, new_y, r2, obstacle_xy) and np.random.random() < 0.3:
+                            direction = np.random.randint(0, SINCOS_LUT_SIZE)
+                            new_x = enemy_x[i] + _SINCOS_LUT[direction, 0] * speed
+                            new_y = enemy_y[i] + _SINCOS_LUT[direction, 1] * speed
+                
+                if not _hits_obstacle(new_x, new_y, r2, obstacle_xy):
+                    enemy_x[i] = new_x
+                    enemy_y[i] = new_y
+        
+        ## Revert to the old position if the final one is invalid
+        if not _cell_empty(obstacle_cells, enemy_x[i], enemy_y[i]) and _hits_obstacle(enemy_x[i], enemy_y[i], r2, obstacle_xy):
+            enemy_x[i] = old_x[k]
+            enemy_y[i] = old_y[k]
+        
+        ## Keep within room boundaries
+        if enemy_x[i] < min_x:
+            enemy_x[i] = min_x
+        elif enemy_x[i] > max_x:
+            enemy_x[i] = max_x
+        if enemy_y[i] < min_y:
+            enemy_y[i] = min_y
+        elif enemy_y[i] > max_y:
+            enemy_y[i] = max_y
+        
+        if distance_sq < ATTACK_RADIUS_SQ:
+            hits += 1
+    
+    return hits
+
 ## Helper function for pixel art rendering
+PIXEL_RECT_PAD = 2  ## the 2px shading lines spill past the rect edges
+HUD_CACHE_SIZE = 256  ## rendered HUD texts kept, least recently used dropped first
+DIRTY_RECT_MAX = 64  ## above this many rects (or half the window in area) a full flip is cheaper than a partial update
+DIRTY_AREA_MAX = WIDTH * HEIGHT // 2
+
+@lru_cache(maxsize=64)
+def _pixel_rect_surface(color, width, height, border_radius):
+    ## Render a shaded pixel-art rect once, on a transparent surface padded by PIXEL_RECT_PAD
+    import pygame
+    surface = pygame.Surface((width + 2 * PIXEL_RECT_PAD, height + 2 * PIXEL_RECT_PAD), pygame.SRCALPHA).convert_alpha()
+    rect = pygame.Rect(PIXEL_RECT_PAD, PIXEL_RECT_PAD, width, height)
+    pygame.draw.rect(surface, color, rect, 0, border_radius)
+    
+    ## Add pixel-style shading
+    red, green, blue = color
+    dark_shade = (max(0, red - 40), max(0, green - 40), max(0, blue - 40))
+    light_shade = (min(255, red + 40), min(255, green + 40), min(255, blue + 40))
+    left, top = rect.x, rect.y
+    right, bottom = left + width - 1, top + height - 1
+    
+    ## Draw dark edge on right and bottom
+    pygame.draw.line(surface, dark_shade, (right, top), (right, bottom), 2)
+    pygame.draw.line(surface, dark_shade, (left, bottom), (right, bottom), 2)
+    
+    ## Draw light edge on top and left
+    pygame.draw.line(surface, light_shade, (left, top), (right, top), 2)
+    pygame.draw.line(surface, light_shade, (left, top), (left, bottom), 2)
+    return surface
+
+@lru_cache(maxsize=64)
+def _glow_surface(color, width, height, border_radius=0):
+    ## Semi-transparent glow layer --> the door pulse only takes a handful of sizes, so each is built once
+    import pygame
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.rect(surface, color, (0, 0, width, height), border_radius=border_radius)
+    return surface
+
+## Debug message sink for Game._dbg while debug mode is off
+def _debug_noop(message, *args):
+    pass
+
+## Debug overlay for Game._draw_enemy_debug while debug mode is off
+def _draw_noop(screen, indices, dirty):
+    pass
+
+## Compile the jitted kernels once with dummy data of the same types the game passes in
+## --> otherwise the first compile lands as a stall on the first frames of play
+def _warm_up_kernels():
+    obstacle_xy = np.zeros((1, 2), dtype=np.float32)
+    obstacle_cells = np.zeros((WIDTH // OBSTACLE_CELL + 3, HEIGHT // OBSTACLE_CELL + 3), dtype=np.bool_)
+    enemy_xy = np.zeros(1)
+    _hits_obstacle(0.0, 0.0, 1.0, obstacle_xy)
+    _update_enemies_numba(enemy_xy, enemy_xy.copy(), np.ones(1), np.zeros(1, dtype=np.intp), np.zeros((1, 2)),
+                          obstacle_xy, obstacle_cells, 0.0, 0.0, 0, 1, 0, 1)
 
 ## Main Game class logic
 class Game:
@@ -107,6 +397,21 @@ class Game:
         
         ## Initialize pygame
         self.pygame.init()
+        
+        ## Cached pygame bindings for the per-frame input and draw paths
+        self._pg_key_get_pressed = pygame.key.get_pressed
+        self._keys_up = (pygame.K_w, pygame.K_UP)
+        self._keys_down = (pygame.K_s, pygame.K_DOWN)
+        self._keys_left = (pygame.K_a, pygame.K_LEFT)
+        self._keys_right = (pygame.K_d, pygame.K_RIGHT)
+        self._wanted_events = [pygame.KEYDOWN, pygame.KEYUP, pygame.QUIT]
+        
+        ## Window events after which the screen contents may be lost --> the next frame is presented in full
+        self._expose_events = frozenset((pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN,
+                                         pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWFOCUSGAINED))
+        self._wanted_events += self._expose_events
+        self._pg_event_get = pygame.event.get
+        self._pg_event_clear = pygame.event.clear
 
         ## Helper functions for pygames
         self.draw_pixel_rect = self._draw_pixel_rect
@@ -114,9 +419,27 @@ class Game:
         
         self.screen = self.pygame.display.set_mode((WIDTH, HEIGHT))
         
+        ## Bound display calls for the per-frame present
+        self._flip = self.pygame.display.flip
+        self._display_update = self.pygame.display.update
+        
+        ## NumPy generator for the batched per-frame enemy randomness
+        self._rng = np.random.default_rng()
+        
+        ## Pre-rendered sprites for the dynamic entities --> one blit each instead of the shaded draw calls
+        self.sprites = {
+            "player": self._render_circle_sprite(PIXEL_BLUE, PLAYER_SIZE//2),
+            "npc": self._render_circle_sprite(PIXEL_GREEN, NPC_SIZE//2),
+            "enemy": self._render_circle_sprite(PIXEL_RED, ENEMY_SIZE//2),
+            "resource": self._render_rect_sprite(PIXEL_YELLOW, RESOURCE_SIZE)
+        }
+        
+        ## Setting to show emotion and reaction text in UI
+        self.show_debug_info = show_debug_info
+        
         ## Set the window caption based on the emotion system
         emotion_system_type = emotion_system_instance.get_system_type()
-        if hasattr(self, 'show_debug_info') and self.show_debug_info:
+        if self.show_debug_info:
             ## Only show condition name in title if debug mode is enabled
             self.pygame.display.set_caption(f"NPC Emotion Game - {emotion_system_type.name}")
         else:
@@ -129,7 +452,11 @@ class Game:
         self.large_font = self.pygame.font.SysFont(None, 48)
         self.running = True
         self.game_over = False
-        self.debug_mode = False
+        
+        ## Debug messages are buffered and flushed periodically from the main loop
+        self._log_buf = deque(maxlen=DEBUG_LOG_SIZE)
+        self._last_log_flush = 0
+        self._set_debug_mode(False)
         
         ## Store participant info
         self.participant_id = participant_id
@@ -138,53 +465,234 @@ class Game:
         ## Set the emotion system
         self.emotion_system = emotion_system_instance
         
-        ## Setting to show emotion and reaction text in UI
-        self.show_debug_info = show_debug_info
+        ## Frames between emotion updates, set by the emotion system (the random one counts its cooldown in frames)
+        self._emotion_interval = getattr(self.emotion_system, "update_interval", EMOTION_UPDATE_INTERVAL)
         
-        ## Timer feature
+        ## Emotion symbols shown in each room, picked once for the condition
+        if self.emotion_system.get_system_type() == EmotionSystem.MACHINE_LEARNING:
+            self._room_emotion_symbols = ML_ROOM_EMOTION_SYMBOLS
+        else:
+            self._room_emotion_symbols = {room_id: EMOTION_SYMBOLS for room_id in (1, 2)}
+        
+        ## Timer feature --> measured on the pygame clock in ms, so dropped frames do not stretch the game
         self.game_time_limit = game_time_limit
+        self._has_time_limit = game_time_limit > 0
+        self._time_limit_ms = int(game_time_limit * 1000)
+        self._get_ticks = self.pygame.time.get_ticks
+        
+        ## Timer text only changes once per second --> keep the last rendered one
+        self._last_timer_sec = None
+        self._last_timer_surf = None
         
-        ## Track room transitions to prevent rapid toggling
-        self.last_room_transition = 0
-        self.room_transition_cooldown = 500  # milliseconds
+        ## Track room transitions to prevent rapid toggling --> counted in frames, the loop runs at a fixed FPS
+        self.room_transition_cooldown = int(0.5 * FPS)  # frames
         
         ## Game state
         self.state = GameState.START_SCREEN
+        self._state_handlers = {
+            GameState.START_SCREEN: self._update_start_screen,
+            GameState.COMPLETED: self._update_completed,
+            GameState.PLAYING: self._update_playing
+        }
         
         ## Frame counter
         self.frame = 0
         
+        ## Texts that never change are rendered once, the HUD ones once per value
+        self._build_static_surfaces()
+        self._hud_cache = OrderedDict()
+        self._hud_state = None
+        self._hud_entries = []
+        
+        ## Health bar composed once per fill width (0-200 px) --> built lazily, blitted at (20, 20)
+        self._health_bar_surfs = {}
+        
+        ## Dirty-rect bookkeeping --> the background currently on screen and the rects drawn over it
+        self._presented_bg = None
+        self._dirty_rects = []
+        
+        ## Scratch Rects for per-frame text placement --> handed out in order, the index restarts every frame
+        self._rect_pool = [self.pygame.Rect(0, 0, 0, 0) for _ in range(RECT_POOL_SIZE)]
+        self._rect_pool_idx = 0
+        self._prev_dirty_rects = []
+        
+        _warm_up_kernels()
         self.reset()
     
     def _draw_pixel_rect(self, surface, color, rect, border_radius=0):
-        self.pygame.draw.rect(surface, color, rect, 0, border_radius)
-        ## Add pixel-style shading
-        dark_shade = (max(0, color[0] - 40), max(0, color[1] - 40), max(0, color[2] - 40))
-        light_shade = (min(255, color[0] + 40), min(255, color[1] + 40), min(255, color[2] + 40))
-        
-        ## Draw dark edge on right and bottom
-        self.pygame.draw.line(surface, dark_shade, 
-                        (rect.x + rect.width - 1, rect.y), 
-                        (rect.x + rect.width - 1, rect.y + rect.height - 1), 2)
-        self.pygame.draw.line(surface, dark_shade, 
-                        (rect.x, rect.y + rect.height - 1), 
-                        (rect.x + rect.width - 1, rect.y + rect.height - 1), 2)
-        
-        ## Draw light edge on top and left
-        self.pygame.draw.line(surface, light_shade, 
-                        (rect.x, rect.y), 
-                        (rect.x + rect.width - 1, rect.y), 2)
-        self.pygame.draw.line(surface, light_shade, 
-                        (rect.x, rect.y), 
-                        (rect.x, rect.y + rect.height - 1), 2)
+        ## Shaded rects only depend on colour, size and corner radius --> blit the cached rendering
+        shaded = _pixel_rect_surface(tuple(color), rect.width, rect.height, border_radius)
+        return surface.blit(shaded, (rect.x - PIXEL_RECT_PAD, rect.y - PIXEL_RECT_PAD))
 
     def _draw_pixel_circle(self, surface, color, center, radius):
-        self.pygame.draw.circle(surface, color, center, radius)
+        draw_circle = self.pygame.draw.circle
+        draw_circle(surface, color, center, radius)
         ## Add pixel-style shading - draw a slightly smaller circle with lighter color to add depth
         highlight_color = (min(255, color[0] + 60), min(255, color[1] + 60), min(255, color[2] + 60))
-        self.pygame.draw.circle(surface, highlight_color, 
-                          (center[0] - int(radius * 0.2), center[1] - int(radius * 0.2)), 
-                          int(radius * 0.4))
+        offset = int(radius * 0.2)
+        draw_circle(surface, highlight_color, (center[0] - offset, center[1] - offset), int(radius * 0.4))
+    
+    def _build_static_surfaces(self):
+        ## Render every text that never changes during a run once, together with its position
+        ## Start screen title with its shadow
+        self._title_surf = self.large_font.render("NPC EMOTION GAME!", True, PIXEL_YELLOW)
+        self._title_rect = self._title_surf.get_rect(center=(WIDTH//2, HEIGHT//4))
+        self._title_shadow_surf = self.large_font.render("NPC EMOTION GAME!", True, PIXEL_DARK_GRAY)
+        self._title_shadow_rect = self._title_rect.move(3, 3)
+        
+        ## Get condition-specific description
+        description = self.emotion_system.get_description()
+        
+        instructions = [
+            "You are an explorer in a dungeon, accompanied by an NPC companion.",
+            description,
+            "",
+            "OBJECTIVES:",
+            "• Collect all 4 resources (yellow squares)",
+            "• Defeat 8 enemies (red circles)",
+            "• Collect 2 resources in Room 1 to open the door",
+            "• Reach the exit in Room 2 after completing all objectives",
+            "",
+            "CONTROLS:",
+            "WASD or Arrow Keys: Move",
+            "SPACE: Attack (must be close to enemy)",
+            "",
+            "Press ENTER or SPACE to start"
+        ]
+        
+        self._instruction_surfs = []
+        y_pos = HEIGHT//3
+        for instruction in instructions:
+            if instruction.startswith("OBJECTIVES:") or instruction.startswith("CONTROLS:"):
+                text = self.font.render(instruction, True, PIXEL_YELLOW)
+                y_pos += 10
+            elif instruction == "":
+                y_pos += 15
+            else:
+                text = self.small_font.render(instruction, True, WHITE)
+            
+            if instruction != "":
+                self._instruction_surfs.append((text, text.get_rect(center=(WIDTH//2, y_pos))))
+            
+            y_pos += 30
+        
+        ## Completion screen header
+        completion_text = self.large_font.render("CONGRATULATIONS!", True, PIXEL_GREEN)
+        completion_rect = completion_text.get_rect(center=(WIDTH//2, HEIGHT//3))
+        message_text = self.font.render("You've successfully completed the game!", True, WHITE)
+        self._completion_surfs = [
+            (self.large_font.render("CONGRATULATIONS!", True, PIXEL_DARK_GRAY), completion_rect.move(3, 3)),
+            (completion_text, completion_rect),
+            (message_text, message_text.get_rect(center=(WIDTH//2, HEIGHT//3 + 60)))
+        ]
+        if self.participant_id:
+            closing_text = self.font.render("Please press esc or close the game and return to the survey to continue", True, PIXEL_YELLOW)
+        else:
+            closing_text = self.font.render("Press R to play again or ESC to quit", True, PIXEL_YELLOW)
+        self._closing_surf = (closing_text, closing_text.get_rect(center=(WIDTH//2, HEIGHT - 100)))
+        
+        ## Participant ID, and the condition only if debug info is enabled
+        self._participant_surfs = []
+        if self.participant_id:
+            id_text = self.small_font.render(f"Participant ID: {self.participant_id}", True, WHITE)
+            self._participant_surfs.append((id_text, id_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 20))))
+            if self.show_debug_info:
+                condition_text = self.small_font.render(f"Condition: {self.condition}", True, WHITE)
+                self._participant_surfs.append((condition_text, condition_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 45))))
+        
+        ## In-game labels
+        self._door_label = self.small_font.render("DOOR", True, BLACK)
+        self._exit_label = self.small_font.render("EXIT", True, BLACK)
+        self._danger_label = self.small_font.render("DANGER", True, PIXEL_RED)
+        
+        ## Emotion bubble symbol per room and emotion --> the draw path indexes by the enum directly
+        self._emotion_symbol_surfs = {
+            room_id: {emotion: self.small_font.render(symbol, True, EMOTION_COLORS[emotion]) for emotion, symbol in symbols.items()}
+            for room_id, symbols in self._room_emotion_symbols.items()
+        }
+    
+    def _render_cached(self, font, text, color):
+        ## HUD values change a few dozen times per game --> render each (font, text, color) only once
+        key = (id(font), text, color)
+        surf = self._hud_cache.get(key)
+        if surf is None:
+            surf = font.render(text, True, color)
+            if len(self._hud_cache) >= HUD_CACHE_SIZE:
+                self._hud_cache.popitem(last=False)
+            self._hud_cache[key] = surf
+        else:
+            self._hud_cache.move_to_end(key)
+        return surf
+    
+    def _pooled_rect(self, surface, center):
+        ## Next scratch Rect sized to the surface and centred --> replaces a per-frame get_rect allocation
+        rect = self._rect_pool[self._rect_pool_idx]
+        self._rect_pool_idx = (self._rect_pool_idx + 1) % RECT_POOL_SIZE
+        rect.size = surface.get_size()
+        rect.center = center
+        return rect
+    
+    def _render_health_bar(self, fill_width):
+        ## Red background and green fill of the HUD health bar on one padded transparent surface
+        bar = self.pygame.Surface((200 + 2 * PIXEL_RECT_PAD, 30 + 2 * PIXEL_RECT_PAD), self.pygame.SRCALPHA).convert_alpha()
+        self.draw_pixel_rect(bar, PIXEL_RED, self.pygame.Rect(PIXEL_RECT_PAD, PIXEL_RECT_PAD, 200, 30))
+        self.draw_pixel_rect(bar, PIXEL_GREEN, self.pygame.Rect(PIXEL_RECT_PAD, PIXEL_RECT_PAD, fill_width, 30))
+        return bar
+    
+    def _render_circle_sprite(self, color, radius):
+        ## Sprite is padded by one pixel, its centre sits at (radius + 1, radius + 1)
+        sprite = self.pygame.Surface((2 * radius + 2, 2 * radius + 2), self.pygame.SRCALPHA).convert_alpha()
+        self.draw_pixel_circle(sprite, color, (radius + 1, radius + 1), radius)
+        return sprite
+    
+    def _render_rect_sprite(self, color, size):
+        ## Padded by one pixel as the 2px shading lines spill past the rect edges
+        sprite = self.pygame.Surface((size + 2, size + 2), self.pygame.SRCALPHA).convert_alpha()
+        self.draw_pixel_rect(sprite, color, self.pygame.Rect(1, 1, size, size))
+        return sprite
+    
+    def _set_debug_mode(self, enabled):
+        ## Debug messages go through _dbg --> a no-op while debug mode is off, queued while it is on
+        if not enabled:
+            self._flush_debug_log()
+        self.debug_mode = enabled
+        self._dbg = self._queue_debug if enabled else _debug_noop
+        self._draw_enemy_debug = self._draw_enemy_health_bars if enabled else _draw_noop
+    
+    def _draw_enemy_health_bars(self, screen, indices, dirty):
+        draw_rect = self.pygame.draw.rect
+        for i in indices:
+            enemy_x, enemy_y = int(self.enemy_x[i]), int(self.enemy_y[i])
+            health_width = ENEMY_SIZE * int(self.enemy_health[i]) // 100
+            dirty.append(draw_rect(screen, RED, 
+                            (enemy_x - ENEMY_SIZE//2, 
+                             enemy_y - ENEMY_SIZE//2 - 8, 
+                             ENEMY_SIZE, 5)))
+            dirty.append(draw_rect(screen, GREEN, 
+                            (enemy_x - ENEMY_SIZE//2, 
+                             enemy_y - ENEMY_SIZE//2 - 8, 
+                             health_width, 5)))
+    
+    def _queue_debug(self, message, *args):
+        ## Formatting is deferred to the flush
+        self._log_buf.append((message, args))
+    
+    def _flush_debug_log(self):
+        ## Write all queued debug messages with a single stdout write
+        if self._log_buf:
+            sys.stdout.write("\n".join(message % args if args else message for message, args in self._log_buf) + "\n")
+            sys.stdout.flush()
+            self._log_buf.clear()
+        self._last_log_flush = self.pygame.time.get_ticks()
+    
+    def _room_bounds(self, room, size):
+        half = size//2
+        return (room["x"] + half, room["x"] + room["width"] - half,
+                room["y"] + half, room["y"] + room["height"] - half)
+    
+    def _blit_circle_sprite(self, sprite, center):
+        offset = sprite.get_width() // 2
+        return self.screen.blit(sprite, (center[0] - offset, center[1] - offset))
     
     def reset(self):
         self.running = True
@@ -194,6 +702,9 @@ class Game:
         self.door_opened = False
         self.current_room = 1  ## Start in room 1
         self.frame = 0  ## Reset frame counter for each run
+        self._start_ticks = None  ## Set on the first playing frame
+        self._elapsed_ms = 0
+        self.last_room_transition = -self.room_transition_cooldown
         
         ## Door unlock effect variables
         self.door_unlock_effect = False
@@ -206,25 +717,9 @@ class Game:
         room_x_offset = (WIDTH - (2 * ROOM_WIDTH + 150)) // 2
         room_y_offset = (HEIGHT - ROOM_HEIGHT) // 2
         
-        self.player = {
-            "x": room_x_offset + 150,
-            "y": room_y_offset + 150,
-            "health": 100,
-            "action": PlayerAction.IDLE,
-            "speed": PLAYER_SPEED,
-            "resources_collected": 0,
-            "enemies_killed": 0
-        }
-        
-        self.npc = {
-            "x": room_x_offset + 100,
-            "y": room_y_offset + 100,
-            "emotion": NPCEmotion.ANTICIPATION,
-            "emotion_lagged": NPCEmotion.ANTICIPATION,
-            "reaction": NPCReaction.FOLLOW,
-            "speed": NPC_SPEED,
-            "attack_cooldown": 0  
-        }
+        self.player = PlayerState(x=room_x_offset + 150, y=room_y_offset + 150)
+        self.npc = NPCState(x=room_x_offset + 100, y=room_y_offset + 100)
+        self._npc_debug_hud = self._npc_debug_surfs() if self.show_debug_info else ()
         
         ## Define rooms with new positions
         self.rooms = {
@@ -232,52 +727,49 @@ class Game:
             2: {"x": room_x_offset + ROOM_WIDTH + 150, "y": room_y_offset, "width": ROOM_WIDTH, "height": ROOM_HEIGHT}
         }
         
+        ## Per-room clamp bounds (x_min, x_max, y_min, y_max) for the player and the NPC --> rooms never move
+        self._player_bounds = {room_id: self._room_bounds(room, PLAYER_SIZE) for room_id, room in self.rooms.items()}
+        self._npc_bounds = {room_id: self._room_bounds(room, NPC_SIZE) for room_id, room in self.rooms.items()}
+        
         ## Generate obstacles for each room
         self.obstacles = self.generate_obstacles()
+        self.obstacle_grid = self.build_obstacle_grid()
         
+        ## Dense per-room flags of the grid cells with obstacles nearby, for the jitted enemy update
+        self.obstacle_cells = {}
+        for room_id, grid in self.obstacle_grid.items():
+            self.obstacle_cells[room_id] = np.zeros((WIDTH // OBSTACLE_CELL + 3, HEIGHT // OBSTACLE_CELL + 3), dtype=np.bool_)
+            for cell_x, cell_y in grid:
+                self.obstacle_cells[room_id][cell_x + 1, cell_y + 1] = True
+        
+        ## Enemies and resources are stored as parallel NumPy arrays (one entry per entity)
         ## Initialize enemies with health, avoiding spawning on obstacles
-        self.enemies = []
-        for _ in range(7):
-            position = self.get_valid_position(1)
-            self.enemies.append({
-                "x": position[0],
-                "y": position[1],
-                "speed": random.uniform(ENEMY_SPEED * 0.8, ENEMY_SPEED * 1.2),
-                "alive": True,
-                "room": 1,
-                "health": 100
-            })
-        
-        for _ in range(8):
-            position = self.get_valid_position(2)
-            self.enemies.append({
-                "x": position[0],
-                "y": position[1],
-                "speed": random.uniform(ENEMY_SPEED * 0.8, ENEMY_SPEED * 1.2),
-                "alive": True,
-                "room": 2,
-                "health": 100
-            })
+        enemy_rooms = [1] * 7 + [2] * 8
+        num_enemies = len(enemy_rooms)
+        self.enemy_x = np.empty(num_enemies, dtype=np.float64)
+        self.enemy_y = np.empty(num_enemies, dtype=np.float64)
+        self.enemy_speed = np.empty(num_enemies, dtype=np.float64)
+        self.enemy_alive = np.ones(num_enemies, dtype=bool)
+        self.enemy_room = np.array(enemy_rooms, dtype=np.int8)
+        self.enemy_health = np.full(num_enemies, 100, dtype=np.int32)
+        for i, room_id in enumerate(enemy_rooms):
+            self.enemy_x[i], self.enemy_y[i] = self.get_valid_position(room_id)
+            self.enemy_speed[i] = random.uniform(ENEMY_SPEED * 0.8, ENEMY_SPEED * 1.2)
         
         ## Initialize resources, avoiding spawning on obstacles
-        self.resources = []
-        for _ in range(2):
-            position = self.get_valid_position(1)
-            self.resources.append({
-                "x": position[0],
-                "y": position[1],
-                "collected": False,
-                "room": 1
-            })
-        
-        for _ in range(2):
-            position = self.get_valid_position(2)
-            self.resources.append({
-                "x": position[0],
-                "y": position[1],
-                "collected": False,
-                "room": 2
-            })
+        resource_rooms = [1] * 2 + [2] * 2
+        num_resources = len(resource_rooms)
+        self.resource_x = np.empty(num_resources, dtype=np.float64)
+        self.resource_y = np.empty(num_resources, dtype=np.float64)
+        self.resource_collected = np.zeros(num_resources, dtype=bool)
+        self.resource_room = np.array(resource_rooms, dtype=np.int8)
+        for i, room_id in enumerate(resource_rooms):
+            self.resource_x[i], self.resource_y[i] = self.get_valid_position(room_id)
+        
+        ## Entities never change room --> partition their indices by room once
+        self.enemies_by_room = {room_id: np.flatnonzero(self.enemy_room == room_id) for room_id in self.rooms}
+        self.resources_by_room = {room_id: np.flatnonzero(self.resource_room == room_id) for room_id in self.rooms}
+        self._rebuild_enemy_grid()
         
         ## Define door - position between rooms
         self.door = {
@@ -288,6 +780,14 @@ class Game:
             "open": False
         }
         
+        ## The door never moves, only its colour changes --> build its rects once
+        self._door_rect = self.pygame.Rect(self.door["x"], self.door["y"], self.door["width"], self.door["height"])
+        self._door_label_rect = self._door_label.get_rect(center=self._door_rect.center)
+        
+        ## Door center and the player's reach around it, for is_player_at_door
+        self._door_zone = (self.door["x"] + self.door["width"] / 2, self.door["y"] + self.door["height"] / 2,
+                           self.door["width"] / 2 + PLAYER_SIZE / 2, self.door["height"] / 2 + PLAYER_SIZE / 2)
+        
         ## Define exit - in room 2
         self.exit = {
             "x": self.rooms[2]["x"] + ROOM_WIDTH - 70,
@@ -296,6 +796,11 @@ class Game:
             "height": 80,
             "room": 2
         }
+        self._exit_rect = self.pygame.Rect(self.exit["x"], self.exit["y"], self.exit["width"], self.exit["height"])
+        self._player_rect = self.pygame.Rect(0, 0, PLAYER_SIZE, PLAYER_SIZE)
+        
+        ## Pre-render the static background as seen from each room
+        self._static_bg = {room_id: self._build_static_background(room_id) for room_id in self.rooms}
         
         ## Initialize the emotion system
         self.emotion_system.initialize(self)
@@ -328,35 +833,112 @@ class Game:
                 ## Exit area in room 2
                 safe_zones.append((room["x"] + ROOM_WIDTH - 150, room["y"] + ROOM_HEIGHT // 2 - 100, 150, 200))
             
-            ## Generate the obstacles
+            ## Generate the obstacles --> each one draws all its attempts as one batch and keeps the first candidate that fits
+            max_attempts = 50
+            safe = np.array(safe_zones)
+            low = (room["x"] + OBSTACLE_SIZE, room["y"] + OBSTACLE_SIZE)
+            high = (room["x"] + room["width"] - OBSTACLE_SIZE + 1, room["y"] + room["height"] - OBSTACLE_SIZE + 1)
             for _ in range(num_obstacles):
-                max_attempts = 50
-                for attempt in range(max_attempts):
-                    x = random.randint(room["x"] + OBSTACLE_SIZE, room["x"] + room["width"] - OBSTACLE_SIZE)
-                    y = random.randint(room["y"] + OBSTACLE_SIZE, room["y"] + room["height"] - OBSTACLE_SIZE)
-                    
-                    ## Check if this position is in a safe zone
-                    in_safe_zone = False
-                    for safe_x, safe_y, safe_w, safe_h in safe_zones:
-                        if (safe_x <= x <= safe_x + safe_w and 
-                            safe_y <= y <= safe_y + safe_h):
-                            in_safe_zone = True
-                            break
-                    
-                    if not in_safe_zone:
-                        ## Check if it overlaps with existing obstacles
-                        overlapping = False
-                        for obs_x, obs_y in obstacles[room_id]:
-                            if math.sqrt((x - obs_x)**2 + (y - obs_y)**2) < OBSTACLE_SIZE * 1.5:
-                                overlapping = True
-                                break
-                        
-                        if not overlapping:
-                            obstacles[room_id].append((x, y))
-                            break
+                candidates = self._rng.integers(low, high, (max_attempts, 2))
+                cand_x, cand_y = candidates[:, 0:1], candidates[:, 1:2]
+                
+                ## Reject candidates in a safe zone
+                in_safe_zone = ((safe[:, 0] <= cand_x) & (cand_x <= safe[:, 0] + safe[:, 2]) &
+                                (safe[:, 1] <= cand_y) & (cand_y <= safe[:, 1] + safe[:, 3])).any(axis=1)
+                fits = ~in_safe_zone
+                
+                ## Reject candidates overlapping existing obstacles
+                if obstacles[room_id]:
+                    placed = np.array(obstacles[room_id])
+                    fits &= ((cand_x - placed[:, 0])**2 + (cand_y - placed[:, 1])**2 >= OBSTACLE_SIZE_SQ * 2.25).all(axis=1)
+                
+                fitting = np.flatnonzero(fits)
+                if fitting.size:
+                    x, y = candidates[fitting[0]]
+                    obstacles[room_id].append((int(x), int(y)))
+        
+        ## Per-room (N, 2) coordinate arrays for vectorized obstacle tests
+        self.obs_xy = {room_id: np.asarray(pts, dtype=np.float32).reshape(-1, 2) for room_id, pts in obstacles.items()}
         
         return obstacles
     
+    def build_obstacle_grid(self):
+        ## Map each grid cell to an array of the obstacles in its 3x3 neighbourhood --> only those can overlap a position in the cell
+        obstacle_grid = {}
+        for room_id, room_obstacles in self.obstacles.items():
+            cells = defaultdict(list)
+            for obs_x, obs_y in room_obstacles:
+                cell_x, cell_y = obs_x // OBSTACLE_CELL, obs_y // OBSTACLE_CELL
+                for nx in (cell_x - 1, cell_x, cell_x + 1):
+                    for ny in (cell_y - 1, cell_y, cell_y + 1):
+                        cells[(nx, ny)].append((obs_x, obs_y))
+            obstacle_grid[room_id] = {cell: np.asarray(pts, dtype=np.float32) for cell, pts in cells.items()}
+        return obstacle_grid
+    
+    def _build_static_background(self, current_room):
+        background = self.pygame.Surface((WIDTH, HEIGHT)).convert()
+        background.fill(BLACK)
+        
+        ## Draw rooms with pixel art styling
+        for room_id, room in self.rooms.items():
+            if room_id == current_room:
+                ## Draw floor for current room
+                floor_rect = self.pygame.Rect(room["x"], room["y"], room["width"], room["height"])
+                self.draw_pixel_rect(background, PIXEL_FLOOR, floor_rect)
+                
+                ## Draw walls with pixel art style
+                wall_thickness = 8
+                
+                ## Top wall
+                top_wall = self.pygame.Rect(room["x"], room["y"], room["width"], wall_thickness)
+                self.draw_pixel_rect(background, PIXEL_WALL, top_wall)
+                
+                ## Bottom wall
+                bottom_wall = self.pygame.Rect(room["x"], room["y"] + room["height"] - wall_thickness, 
+                                        room["width"], wall_thickness)
+                self.draw_pixel_rect(background, PIXEL_WALL, bottom_wall)
+                
+                ## Left wall
+                left_wall = self.pygame.Rect(room["x"], room["y"], wall_thickness, room["height"])
+                self.draw_pixel_rect(background, PIXEL_WALL, left_wall)
+                
+                ## Right wall
+                right_wall = self.pygame.Rect(room["x"] + room["width"] - wall_thickness, room["y"], 
+                                       wall_thickness, room["height"])
+                self.draw_pixel_rect(background, PIXEL_WALL, right_wall)
+            else:
+                ## Draw outline for non-current room
+                self.pygame.draw.rect(background, PIXEL_DARK_GRAY, 
+                               (room["x"], room["y"], room["width"], room["height"]), 3)
+        
+        ## Draw obstacles in the current room
+        for obs_x, obs_y in self.obstacles[current_room]:
+            obstacle_rect = self.pygame.Rect(obs_x - OBSTACLE_SIZE//2, obs_y - OBSTACLE_SIZE//2, 
+                                      OBSTACLE_SIZE, OBSTACLE_SIZE)
+            self.draw_pixel_rect(background, PIXEL_OBSTACLE, obstacle_rect, border_radius=3)
+        
+        ## Draw exit in room 2 with frame and glow effect
+        if current_room == 2:
+            ## Draw a subtle glow/halo effect around the exit
+            for i in range(3):
+                glow_color = (min(255, PIXEL_GREEN[0] + 20), 
+                            min(255, PIXEL_GREEN[1] + 20), 
+                            min(255, PIXEL_GREEN[2] + 20), 
+                            100 - i*30) 
+                
+                s = _glow_surface(glow_color, self.exit["width"] + i*4, self.exit["height"] + i*4)
+                background.blit(s, (self.exit["x"] - i*2, self.exit["y"] - i*2))
+            
+            ## Draw the actual exit
+            exit_rect = self._exit_rect
+            self.draw_pixel_rect(background, PIXEL_GREEN, exit_rect)
+            
+            ## Add "EXIT" text
+            exit_text_rect = self._exit_label.get_rect(center=exit_rect.center)
+            background.blit(self._exit_label, exit_text_rect)
+        
+        return background
+    
     def get_valid_position(self, room_id):
         ## Get a valid position in the room that's not on an obstacle
         room = self.rooms[room_id]
@@ -370,7 +952,7 @@ class Game:
             ## Check if position is too close to any obstacle
             too_close = False
             for obs_x, obs_y in self.obstacles[room_id]:
-                if math.sqrt((x - obs_x)**2 + (y - obs_y)**2) < OBSTACLE_SIZE + 30:
+                if (x - obs_x)**2 + (y - obs_y)**2 < (OBSTACLE_SIZE + 30)**2:
                     too_close = True
                     break
             
@@ -385,371 +967,357 @@ class Game:
     
     def is_valid_move(self, x, y, size):
         ## Check if a position is valid (not inside an obstacle)
-        room_id = self.current_room
-        
-        for obs_x, obs_y in self.obstacles[room_id]:
-            if math.sqrt((x - obs_x)**2 + (y - obs_y)**2) < (OBSTACLE_SIZE + size) / 2:
-                return False
+        nearby = self.obstacle_grid[self.current_room].get((int(x // OBSTACLE_CELL), int(y // OBSTACLE_CELL)))
+        if nearby is None:
+            return True
         
-        return True
+        ## Jitted scan over the few nearby obstacles --> cheaper than dispatching NumPy ufuncs on a handful of rows
+        return not _hits_obstacle(float(x), float(y), ((OBSTACLE_SIZE + size) * 0.5)**2, nearby)
+    
+    def active_enemies(self):
+        ## Indices of the alive enemies in the current room --> only the room's own entries are tested
+        room_enemies = self.enemies_by_room[self.current_room]
+        return room_enemies[self.enemy_alive[room_enemies]]
+    
+    def active_resources(self):
+        ## Indices of the uncollected resources in the current room
+        room_resources = self.resources_by_room[self.current_room]
+        return room_resources[~self.resource_collected[room_resources]]
+    
+    def _rebuild_enemy_grid(self):
+        ## Bucket the active enemies into grid cells, rebuilt once per tick before the nearest-enemy queries
+        self.enemy_grid = defaultdict(list)
+        active = self.active_enemies()
+        for i in active:
+            self.enemy_grid[(int(self.enemy_x[i] // ENEMY_CELL), int(self.enemy_y[i] // ENEMY_CELL))].append(i)
+        self.enemy_grid_count = active.size
+    
+    def _nearest_enemy(self, px, py):
+        ## (index, squared distance) of the active enemy closest to (px, py), (None, None) if there is none
+        return _grid_nearest(self.enemy_grid, self.enemy_grid_count, self.enemy_x, self.enemy_y, ENEMY_CELL, px, py)
+    
+    def _nearest_resource(self, px, py):
+        ## (index, squared distance) of the uncollected resource in the current room closest to (px, py), (None, None) if there is none
+        ## --> a room holds a couple of resources, one masked argmin over its indices beats any spatial structure
+        candidates = self.active_resources()
+        if candidates.size == 0:
+            return None, None
+        dx = self.resource_x[candidates] - px
+        dy = self.resource_y[candidates] - py
+        dist_sq = dx*dx + dy*dy
+        nearest = int(np.argmin(dist_sq))
+        return int(candidates[nearest]), float(dist_sq[nearest])
     
     def get_nearest_enemy_distance(self):
-        min_distance = float('inf')
-        for enemy in self.enemies:
-            if enemy["room"] == self.current_room and enemy["alive"]:
-                distance = math.sqrt((self.player["x"] - enemy["x"])**2 + (self.player["y"] - enemy["y"])**2)
-                min_distance = min(min_distance, distance)
-        return min_distance if min_distance != float('inf') else 1000
+        nearest, nearest_sq = self._nearest_enemy(self.player.x, self.player.y)
+        return 1000 if nearest is None else math.sqrt(nearest_sq)
     
     def get_nearest_resource_distance(self):
-        min_distance = float('inf')
-        for resource in self.resources:
-            if resource["room"] == self.current_room and not resource["collected"]:
-                distance = math.sqrt((self.player["x"] - resource["x"])**2 + (self.player["y"] - resource["y"])**2)
-                min_distance = min(min_distance, distance)
-        return min_distance if min_distance != float('inf') else 1000
+        nearest, nearest_sq = self._nearest_resource(self.player.x, self.player.y)
+        return 1000 if nearest is None else math.sqrt(nearest_sq)
+    
+    def get_nearest_resource_to_npc(self):
+        ## Index of the uncollected resource in the current room closest to the NPC, None if there is none
+        return self._nearest_resource(self.npc.x, self.npc.y)[0]
     
     def update_npc_emotion(self):
-        self.npc["emotion_lagged"] = self.npc["emotion"]
+        self.npc.emotion_lagged = self.npc.emotion
         
         ## Use the emotion system to determine the next emotion
-        self.npc["emotion"] = self.emotion_system.determine_emotion(
-            self.player["health"],
+        self.npc.emotion = self.emotion_system.determine_emotion(
+            self.player.health,
             self.get_nearest_enemy_distance(),
             self.get_nearest_resource_distance(),
             self.lagged_player_action,
             self.current_room,
-            self.player["x"],
-            self.player["y"],
-            self.npc["x"],
-            self.npc["y"],
-            self.player["resources_collected"],
-            self.player["enemies_killed"],
-            self.npc["emotion_lagged"],
-            self.player["action"]
+            self.player.x,
+            self.player.y,
+            self.npc.x,
+            self.npc.y,
+            self.player.resources_collected,
+            self.player.enemies_killed,
+            self.npc.emotion_lagged,
+            self.player.action
         )
         
         ## Set reaction based on emotion
         self.update_npc_reaction()
+        
+        ## Debug text follows the emotion --> re-rendered only when it changes
+        if self.show_debug_info and self.npc.emotion != self.npc.emotion_lagged:
+            self._npc_debug_hud = self._npc_debug_surfs()
+    
+    def _npc_debug_surfs(self):
+        npc = self.npc
+        return ((self._render_cached(self.small_font, f"Emotion: {npc.emotion.value}", WHITE), HUD_EMOTION_POS),
+                (self._render_cached(self.small_font, f"Reaction: {npc.reaction.value}", WHITE), HUD_REACTION_POS))
     
     def update_npc_reaction(self):
         ## Update NPC reaction based on its emotion --> decoupled system advantage
-        if self.npc["emotion"] == NPCEmotion.ANTICIPATION:
-            self.npc["reaction"] = NPCReaction.FOLLOW
-        elif self.npc["emotion"] == NPCEmotion.HAPPINESS:
-            self.npc["reaction"] = NPCReaction.NOTIFY_RESOURCE
-        elif self.npc["emotion"] == NPCEmotion.FEAR:
-            self.npc["reaction"] = NPCReaction.NOTIFY_DANGER
-        elif self.npc["emotion"] == NPCEmotion.ANGER:
-            self.npc["reaction"] = NPCReaction.ATTACK_ENEMY
-        elif self.npc["emotion"] == NPCEmotion.SURPRISE:
-            self.npc["reaction"] = NPCReaction.NOTIFY_SURPRISE
-        elif self.npc["emotion"] == NPCEmotion.SADNESS:
-            self.npc["reaction"] = NPCReaction.PROVIDE_HEALING
+        self.npc.reaction = REACTION_MAP[self.npc.emotion]
     
     def update_npc_position(self):
         IDEAL_DISTANCE = 60
         MIN_DISTANCE = 40
+        npc, player = self.npc, self.player
+        sqrt = math.sqrt
         
         ## Decrease attack cooldown
-        if self.npc["attack_cooldown"] > 0:
-            self.npc["attack_cooldown"] -= 1
+        if npc.attack_cooldown > 0:
+            npc.attack_cooldown -= 1
         
         ## Save the current position
-        old_x, old_y = self.npc["x"], self.npc["y"]
+        old_x, old_y = npc.x, npc.y
         moved = False
         
-        if self.npc["reaction"] == NPCReaction.FOLLOW:
-            dx = self.player["x"] - self.npc["x"]
-            dy = self.player["y"] - self.npc["y"]
-            distance = math.sqrt(dx**2 + dy**2)
+        if npc.reaction == NPCReaction.FOLLOW:
+            dx = player.x - npc.x
+            dy = player.y - npc.y
+            distance = sqrt(dx**2 + dy**2)
             
             if distance > 0:
                 dx /= distance
                 dy /= distance
                 
-                ## Only move if sufficiently far from ideal position to prevent twitching 
-                if distance > IDEAL_DISTANCE + 10:
-                    speed_factor = 1.5
-                    self.npc["x"] += dx * self.npc["speed"] * speed_factor
-                    self.npc["y"] += dy * self.npc["speed"] * speed_factor
-                    moved = True
-                elif distance < MIN_DISTANCE:
-                    speed_factor = -0.5
-                    self.npc["x"] += dx * self.npc["speed"] * speed_factor
-                    self.npc["y"] += dy * self.npc["speed"] * speed_factor
-                    moved = True
-                elif distance > IDEAL_DISTANCE:
-                    ## Add a threshold to prevent minor glithcy movements
-                    if distance > IDEAL_DISTANCE + 5:
-                        speed_factor = 1.0
-                        self.npc["x"] += dx * self.npc["speed"] * speed_factor
-                        self.npc["y"] += dy * self.npc["speed"] * speed_factor
-                        moved = True
-        
-        elif self.npc["reaction"] == NPCReaction.NOTIFY_RESOURCE or self.npc["reaction"] == NPCReaction.NOTIFY_DANGER:
-            dx = self.player["x"] - self.npc["x"]
-            dy = self.player["y"] - self.npc["y"]
-            distance = math.sqrt(dx**2 + dy**2)
+                ## Only move if sufficiently far from ideal position to prevent twitching, with a threshold of ideal + 5
+                ## to prevent minor glitchy movements --> the bands are disjoint, so summing the masked factors needs no branching
+                speed_factor = (1.5 * (distance > IDEAL_DISTANCE + 10)
+                                - 0.5 * (distance < MIN_DISTANCE)
+                                + 1.0 * (IDEAL_DISTANCE + 5 < distance <= IDEAL_DISTANCE + 10))
+                npc.x += dx * npc.speed * speed_factor
+                npc.y += dy * npc.speed * speed_factor
+                moved = speed_factor != 0
+        
+        elif npc.reaction == NPCReaction.NOTIFY_RESOURCE or npc.reaction == NPCReaction.NOTIFY_DANGER:
+            dx = player.x - npc.x
+            dy = player.y - npc.y
+            distance_sq = dx*dx + dy*dy
             
-            if distance > IDEAL_DISTANCE * 1.5:
+            ## Compare squared --> the sqrt is only needed to normalise an actual move
+            if distance_sq > (IDEAL_DISTANCE * 1.5)**2:
+                distance = sqrt(distance_sq)
                 dx /= distance
                 dy /= distance
-                self.npc["x"] += dx * self.npc["speed"] * 1.2
-                self.npc["y"] += dy * self.npc["speed"] * 1.2
+                npc.x += dx * npc.speed * 1.2
+                npc.y += dy * npc.speed * 1.2
                 moved = True
         
-        elif self.npc["reaction"] == NPCReaction.ATTACK_ENEMY:
-            nearest_enemy = None
-            min_distance = float('inf')
-            
-            for i, enemy in enumerate(self.enemies):
-                if enemy["room"] == self.current_room and enemy["alive"]:
-                    distance = math.sqrt((self.npc["x"] - enemy["x"])**2 + (self.npc["y"] - enemy["y"])**2)
-                    if distance < min_distance:
-                        min_distance = distance
-                        nearest_enemy = i
+        elif npc.reaction == NPCReaction.ATTACK_ENEMY:
+            nearest_enemy, min_distance_sq = self._nearest_enemy(npc.x, npc.y)
             
             if nearest_enemy is not None:
-                if min_distance > ATTACK_RADIUS + 5:  # Added threshold
-                    dx = self.enemies[nearest_enemy]["x"] - self.npc["x"]
-                    dy = self.enemies[nearest_enemy]["y"] - self.npc["y"]
-                    dist = math.sqrt(dx**2 + dy**2)
-                    if dist > 0:
-                        dx /= dist
-                        dy /= dist
-                        self.npc["x"] += dx * self.npc["speed"] * 1.2
-                        self.npc["y"] += dy * self.npc["speed"] * 1.2
-                        moved = True
-                elif min_distance < ATTACK_RADIUS and self.npc["attack_cooldown"] == 0:
-                    self.enemies[nearest_enemy]["health"] -= NPC_DAMAGE
-                    self.npc["attack_cooldown"] = 30 
+                if min_distance_sq > (ATTACK_RADIUS + 5)**2:  # Added threshold
+                    ## Reuse the squared distance from the nearest-enemy search --> it is past the threshold, so never zero
+                    dist = sqrt(min_distance_sq)
+                    dx = (self.enemy_x[nearest_enemy] - npc.x) / dist
+                    dy = (self.enemy_y[nearest_enemy] - npc.y) / dist
+                    npc.x += dx * npc.speed * 1.2
+                    npc.y += dy * npc.speed * 1.2
+                    moved = True
+                elif min_distance_sq < ATTACK_RADIUS_SQ and npc.attack_cooldown == 0:
+                    self.enemy_health[nearest_enemy] -= NPC_DAMAGE
+                    npc.attack_cooldown = 30 
                     
                     ## Only kill enemy if health drops to zero or below
-                    if self.enemies[nearest_enemy]["health"] <= 0:
-                        self.enemies[nearest_enemy]["alive"] = False
-                        self.player["enemies_killed"] += 1
+                    if self.enemy_health[nearest_enemy] <= 0:
+                        self.enemy_alive[nearest_enemy] = False
+                        player.enemies_killed += 1
                         self.enemies_killed += 1
-                        if self.debug_mode:
-                            print(f"NPC killed an enemy! Total: {self.player['enemies_killed']}/8")
+                        self._dbg("NPC killed an enemy! Total: %d/8", player.enemies_killed)
         
-        elif self.npc["reaction"] == NPCReaction.PROVIDE_HEALING:
-            dx = self.player["x"] - self.npc["x"]
-            dy = self.player["y"] - self.npc["y"]
-            distance = math.sqrt(dx**2 + dy**2)
+        elif npc.reaction == NPCReaction.PROVIDE_HEALING:
+            dx = player.x - npc.x
+            dy = player.y - npc.y
+            distance_sq = dx*dx + dy*dy
             
-            if distance > ATTACK_RADIUS + 5: 
+            if distance_sq > (ATTACK_RADIUS + 5)**2: 
+                distance = sqrt(distance_sq)
                 dx /= distance
                 dy /= distance
-                self.npc["x"] += dx * self.npc["speed"] * 1.5
-                self.npc["y"] += dy * self.npc["speed"] * 1.5
+                npc.x += dx * npc.speed * 1.5
+                npc.y += dy * npc.speed * 1.5
                 moved = True
             else:
                 healing_amount = 10
-                old_health = self.player["health"]
-                self.player["health"] = min(self.player["health"] + healing_amount, 100)
+                old_health = player.health
+                player.health = min(player.health + healing_amount, 100)
         
         ## Check if NPC's new position is valid
-        if not self.is_valid_move(self.npc["x"], self.npc["y"], NPC_SIZE):
+        if not self.is_valid_move(npc.x, npc.y, NPC_SIZE):
             ## If not valid, revert to old position
-            self.npc["x"], self.npc["y"] = old_x, old_y
+            npc.x, npc.y = old_x, old_y
         
         ## Keep NPC in the current room
-        current_room = self.rooms[self.current_room]
-        self.npc["x"] = max(current_room["x"] + NPC_SIZE//2, min(self.npc["x"], current_room["x"] + current_room["width"] - NPC_SIZE//2))
-        self.npc["y"] = max(current_room["y"] + NPC_SIZE//2, min(self.npc["y"], current_room["y"] + current_room["height"] - NPC_SIZE//2))
+        rx0, rx1, ry0, ry1 = self._npc_bounds[self.current_room]
+        if npc.x < rx0:
+            npc.x = rx0
+        elif npc.x > rx1:
+            npc.x = rx1
+        if npc.y < ry0:
+            npc.y = ry0
+        elif npc.y > ry1:
+            npc.y = ry1
         
         ## Round the NPC position to prevent sub-pixel rendering which can cause twitching
         if not moved:
-            self.npc["x"] = round(self.npc["x"])
-            self.npc["y"] = round(self.npc["y"])
+            npc.x = round(npc.x)
+            npc.y = round(npc.y)
     
     def update_enemies(self):
-        for enemy in self.enemies:
-            if enemy["room"] == self.current_room and enemy["alive"]:
-                ## Save current position
-                old_x, old_y = enemy["x"], enemy["y"]
-                
-                ## Random movement --> reduced to make enemies less erratic
-                enemy["x"] += random.uniform(-enemy["speed"] * 0.5, enemy["speed"] * 0.5)
-                enemy["y"] += random.uniform(-enemy["speed"] * 0.5, enemy["speed"] * 0.5)
-                
-                ## enemies chase player if within detection radius
-                player_distance = math.sqrt((self.player["x"] - enemy["x"])**2 + (self.player["y"] - enemy["y"])**2)
-                if player_distance < ENEMY_DETECTION_RADIUS:
-                    ## Calculate direct path to player
-                    dx = self.player["x"] - enemy["x"]
-                    dy = self.player["y"] - enemy["y"]
-                    if player_distance > 0:
-                        dx /= player_distance
-                        dy /= player_distance
-                        
-                        ## Try direct movement first
-                        new_x = enemy["x"] + dx * enemy["speed"]
-                        new_y = enemy["y"] + dy * enemy["speed"]
-                        
-                        ## Check if direct path is blocked
-                        if not self.is_valid_move(new_x, new_y, ENEMY_SIZE):
-                            ## Try horizontal movement only
-                            new_x = enemy["x"] + dx * enemy["speed"]
-                            new_y = enemy["y"]
-                            
-                            ## If still blocked, try vertical movement only
-                            if not self.is_valid_move(new_x, new_y, ENEMY_SIZE):
-                                new_x = enemy["x"]
-                                new_y = enemy["y"] + dy * enemy["speed"]
-                                
-                                ## If still blocked, try a random direction to avoid getting stuck
-                                if not self.is_valid_move(new_x, new_y, ENEMY_SIZE) and random.random() < 0.3:
-                                    angle = random.uniform(0, 2 * math.pi)
-                                    new_x = enemy["x"] + math.cos(angle) * enemy["speed"]
-                                    new_y = enemy["y"] + math.sin(angle) * enemy["speed"]
-                            
-                        ## Update position if possible
-                        if self.is_valid_move(new_x, new_y, ENEMY_SIZE):
-                            enemy["x"], enemy["y"] = new_x, new_y
-                
-                ## Check if the enemy's final position is valid
-                if not self.is_valid_move(enemy["x"], enemy["y"], ENEMY_SIZE):
-                    ## If not valid, revert to old position
-                    enemy["x"], enemy["y"] = old_x, old_y
-                
-                ## Keep within room boundaries
-                enemy["x"] = max(self.rooms[self.current_room]["x"] + ENEMY_SIZE//2, 
-                               min(enemy["x"], self.rooms[self.current_room]["x"] + self.rooms[self.current_room]["width"] - ENEMY_SIZE//2))
-                enemy["y"] = max(self.rooms[self.current_room]["y"] + ENEMY_SIZE//2, 
-                               min(enemy["y"], self.rooms[self.current_room]["y"] + self.rooms[self.current_room]["height"] - ENEMY_SIZE//2))
-                
-                ## Damage player if close enough
-                if player_distance < ATTACK_RADIUS:
-                    self.player["health"] -= ENEMY_DAMAGE / FPS
-                    self.player["health"] = max(0, self.player["health"])
-                    if self.player["health"] <= 0:
-                        print("You were defeated by an enemy!")
+        active = self.active_enemies()
+        if active.size == 0:
+            return
+        
+        ## Random movement for every active enemy drawn in one call --> reduced to make enemies less erratic
+        jitter = self._rng.uniform(-0.5, 0.5, (active.size, 2)) * self.enemy_speed[active, None]
+        
+        room = self.rooms[self.current_room]
+        hits = _update_enemies_numba(
+            self.enemy_x, self.enemy_y, self.enemy_speed, active, jitter,
+            self.obs_xy[self.current_room], self.obstacle_cells[self.current_room],
+            float(self.player.x), float(self.player.y),
+            room["x"] + ENEMY_SIZE//2, room["x"] + room["width"] - ENEMY_SIZE//2,
+            room["y"] + ENEMY_SIZE//2, room["y"] + room["height"] - ENEMY_SIZE//2
+        )
+        
+        ## Damage player once per enemy close enough
+        player = self.player
+        for _ in range(hits):
+            player.health -= ENEMY_DAMAGE / FPS
+            player.health = max(0, player.health)
+            if player.health <= 0:
+                print("You were defeated by an enemy!")
     
     def check_resource_collection(self):
-        for resource in self.resources:
-            if (resource["room"] == self.current_room and not resource["collected"] and
-                math.sqrt((self.player["x"] - resource["x"])**2 + (self.player["y"] - resource["y"])**2) < ATTACK_RADIUS):
-                resource["collected"] = True
-                self.player["resources_collected"] += 1
-                self.resources_collected += 1
-                self.player["health"] = min(self.player["health"] + RESOURCE_HEAL, 100)
-                
-                ## Open door in room 1 if 2 resources collected (minimum requirement)
-                if self.resources_collected >= 2 and not self.door["open"]:
-                    self.door["open"] = True
-                    ## Add door unlock effect that persists until door is used
-                    self.door_unlock_effect = True
-                    self.door_unlock_timer = -1  ## -1 indicates persist until door is used
-                    if self.debug_mode:
-                        print(f"Door opened! Collected {self.resources_collected} resources.")
+        ## One distance mask over the active resources, the per-resource bookkeeping only runs on a pickup
+        candidates = self.active_resources()
+        if candidates.size == 0:
+            return
+        
+        dx = self.resource_x[candidates] - self.player.x
+        dy = self.resource_y[candidates] - self.player.y
+        collected = candidates[dx*dx + dy*dy < ATTACK_RADIUS_SQ]
+        if collected.size == 0:
+            return
+        
+        self.resource_collected[collected] = True
+        for _ in range(collected.size):
+            self.player.resources_collected += 1
+            self.resources_collected += 1
+            self.player.health = min(self.player.health + RESOURCE_HEAL, 100)
+            
+            ## Open door in room 1 if 2 resources collected (minimum requirement)
+            if self.resources_collected >= 2 and not self.door["open"]:
+                self.door["open"] = True
+                ## Add door unlock effect that persists until door is used
+                self.door_unlock_effect = True
+                self.door_unlock_timer = -1  ## -1 indicates persist until door is used
+                self._dbg("Door opened! Collected %d resources.", self.resources_collected)
     
     def is_player_at_door(self):
         ## Dedicated function to handle door detection and player interaction
-        ## Player center position
-        player_center_x = self.player["x"]
-        player_center_y = self.player["y"]
-        
-        ## Door center and dimensions
-        door_center_x = self.door["x"] + self.door["width"] / 2
-        door_center_y = self.door["y"] + self.door["height"] / 2
-        
-        ## Check if player is close to the center of the door (horizontally and vertically)
-        dx = abs(player_center_x - door_center_x)
-        dy = abs(player_center_y - door_center_y)
+        ## Door center and thresholds are precomputed in reset()
+        door_center_x, door_center_y, door_x_threshold, door_y_threshold = self._door_zone
         
         ## Only consider the player at the door if they're close to the center horizontally and within the vertical span of the door
-        door_x_threshold = self.door["width"] / 2 + PLAYER_SIZE / 2
-        door_y_threshold = self.door["height"] / 2 + PLAYER_SIZE / 2
-        
-        return dx < door_x_threshold and dy < door_y_threshold
+        return abs(self.player.x - door_center_x) < door_x_threshold and abs(self.player.y - door_center_y) < door_y_threshold
     
     def check_door_interaction(self):
         ## Check if player is at door using improved detection
         if self.is_player_at_door():
-            current_time = self.pygame.time.get_ticks()
-            
             ## Only allow room transitions after cooldown has passed
-            if current_time - self.last_room_transition > self.room_transition_cooldown:
+            if self.frame - self.last_room_transition > self.room_transition_cooldown:
                 if self.door["open"]:
                     ## Turn off the door unlock effect when player uses the door
-                    if hasattr(self, 'door_unlock_effect') and self.door_unlock_effect:
+                    if self.door_unlock_effect:
                         self.door_unlock_effect = False
                     
                     ## Change rooms
                     if self.current_room == 1:
-                        if self.debug_mode:
-                            print("Transitioning to Room 2")
+                        self._dbg("Transitioning to Room 2")
                         self.current_room = 2
                         ## Position the player on the left side of room 2
-                        self.player["x"] = self.rooms[2]["x"] + 50
-                        self.player["y"] = self.rooms[2]["y"] + ROOM_HEIGHT/2
+                        self.player.x = self.rooms[2]["x"] + 50
+                        self.player.y = self.rooms[2]["y"] + ROOM_HEIGHT/2
                         ## Position NPC near the player
-                        self.npc["x"] = self.player["x"] - 30
-                        self.npc["y"] = self.player["y"]
-                        self.last_room_transition = current_time
+                        self.npc.x = self.player.x - 30
+                        self.npc.y = self.player.y
+                        self.last_room_transition = self.frame
                     else:
-                        if self.debug_mode:
-                            print("Transitioning to Room 1")
+                        self._dbg("Transitioning to Room 1")
                         self.current_room = 1
                         ## Position the player on the right side of room 1
-                        self.player["x"] = self.rooms[1]["x"] + ROOM_WIDTH - 50
-                        self.player["y"] = self.rooms[1]["y"] + ROOM_HEIGHT/2
+                        self.player.x = self.rooms[1]["x"] + ROOM_WIDTH - 50
+                        self.player.y = self.rooms[1]["y"] + ROOM_HEIGHT/2
                         ## Position NPC near the player
-                        self.npc["x"] = self.player["x"] - 30
-                        self.npc["y"] = self.player["y"]
-                        self.last_room_transition = current_time
+                        self.npc.x = self.player.x - 30
+                        self.npc.y = self.player.y
+                        self.last_room_transition = self.frame
                 else:
                     ## Indicate the door is locked
-                    if self.debug_mode:
-                        print("Door is locked. Collect more resources!")
+                    self._dbg("Door is locked. Collect more resources!")
                     ## Push player away from closed door
-                    if self.player["x"] < self.door["x"]:
-                        self.player["x"] -= 10
+                    if self.player.x < self.door["x"]:
+                        self.player.x -= 10
                     else:
-                        self.player["x"] += 10
+                        self.player.x += 10
     
     def check_exit_interaction(self):
         if self.current_room == 2:
-            player_rect = self.pygame.Rect(self.player["x"] - PLAYER_SIZE/2, self.player["y"] - PLAYER_SIZE/2, PLAYER_SIZE, PLAYER_SIZE)
-            exit_rect = self.pygame.Rect(self.exit["x"], self.exit["y"], self.exit["width"], self.exit["height"])
+            ## Move the cached player rect in place --> int() truncates like the Rect constructor does
+            player_rect = self._player_rect
+            player_rect.topleft = (int(self.player.x - PLAYER_SIZE/2), int(self.player.y - PLAYER_SIZE/2))
             
-            if player_rect.colliderect(exit_rect):
-                if self.player["enemies_killed"] >= 8 and self.player["resources_collected"] >= 4:
+            if player_rect.colliderect(self._exit_rect):
+                if self.player.enemies_killed >= 8 and self.player.resources_collected >= 4:
                     self.state = GameState.COMPLETED
-                    if self.debug_mode:
-                        print("Congratulations! You've completed the game!")
+                    self._dbg("Congratulations! You've completed the game!")
                 else:
                     ## Give feedback on what's missing
-                    missing_resources = max(0, 4 - self.player["resources_collected"])
-                    missing_enemies = max(0, 5 - self.player["enemies_killed"])
+                    missing_resources = max(0, 4 - self.player.resources_collected)
+                    missing_enemies = max(0, 5 - self.player.enemies_killed)
                     
-                    if self.debug_mode:
-                        if missing_resources > 0 and missing_enemies > 0:
-                            print(f"You need {missing_resources} more resources and {missing_enemies} more enemies defeated!")
-                        elif missing_resources > 0:
-                            print(f"You need {missing_resources} more resources!")
-                        elif missing_enemies > 0:
-                            print(f"You need to defeat {missing_enemies} more enemies!")
+                    if missing_resources > 0 and missing_enemies > 0:
+                        self._dbg("You need %d more resources and %d more enemies defeated!", missing_resources, missing_enemies)
+                    elif missing_resources > 0:
+                        self._dbg("You need %d more resources!", missing_resources)
+                    elif missing_enemies > 0:
+                        self._dbg("You need to defeat %d more enemies!", missing_enemies)
     
     def check_attack(self):
-        if self.player["action"] == PlayerAction.ATTACK:
-            for i, enemy in enumerate(self.enemies):
-                if enemy["room"] == self.current_room and enemy["alive"]:
-                    if math.sqrt((self.player["x"] - enemy["x"])**2 + (self.player["y"] - enemy["y"])**2) < ATTACK_RADIUS:
-                        ## Player does high damage to guarantee one-hit kills
-                        enemy["health"] -= PLAYER_DAMAGE
-                        
-                        if enemy["health"] <= 0:
-                            enemy["alive"] = False
-                            self.player["enemies_killed"] += 1
-                            self.enemies_killed += 1
-                            if self.debug_mode:
-                                print(f"Player killed enemy! Total: {self.player['enemies_killed']}/8")
+        if self.player.action == PlayerAction.ATTACK:
+            ## Every active enemy within reach is hit at once
+            room_enemies = self.enemies_by_room[self.current_room]
+            dx = self.enemy_x[room_enemies] - self.player.x
+            dy = self.enemy_y[room_enemies] - self.player.y
+            hit = room_enemies[self.enemy_alive[room_enemies] & (dx*dx + dy*dy < ATTACK_RADIUS_SQ)]
+            
+            ## Player does high damage to guarantee one-hit kills
+            self.enemy_health[hit] -= PLAYER_DAMAGE
+            killed = hit[self.enemy_health[hit] <= 0]
+            self.enemy_alive[killed] = False
+            
+            for _ in range(killed.size):
+                self.player.enemies_killed += 1
+                self.enemies_killed += 1
+                self._dbg("Player killed enemy! Total: %d/8", self.player.enemies_killed)
+    
+    def _poll_events(self):
+        ## Only the event types the game reacts to are fetched, filtered on the SDL side
+        events = self._pg_event_get(self._wanted_events)
+        ## Drop the leftovers (mouse motion, other window events) without pumping, so the queue never fills up
+        self._pg_event_clear(pump=False)
+        
+        ## A restored or uncovered window forgets the static background --> drop the dirty-rect state
+        expose = self._expose_events
+        for event in events:
+            if event.type in expose:
+                self._presented_bg = None
+                break
+        return events
     
     def handle_start_screen_events(self):
-        for event in self.pygame.event.get():
+        for event in self._poll_events():
             if event.type == self.pygame.QUIT:
                 ## Removed ability to quit
                 pass
@@ -761,12 +1329,12 @@ class Game:
                     self.state = GameState.PLAYING
                 ## Debug mode toggle
                 elif event.key == self.pygame.K_d and self.pygame.key.get_mods() & self.pygame.KMOD_CTRL:
-                    self.debug_mode = not self.debug_mode
+                    self._set_debug_mode(not self.debug_mode)
                     print(f"Debug mode {'enabled' if self.debug_mode else 'disabled'}")
     
     
     def handle_completed_screen_events(self):
-        for event in self.pygame.event.get():
+        for event in self._poll_events():
             if event.type == self.pygame.QUIT:
                 ## Enable ability to quit when in completed state for all three games
                 self.running = False
@@ -779,7 +1347,7 @@ class Game:
                     pass
     
     def handle_playing_events(self):
-        for event in self.pygame.event.get():
+        for event in self._poll_events():
             if event.type == self.pygame.QUIT:
                 ## Removed ability to quit
                 pass
@@ -791,11 +1359,11 @@ class Game:
                     ## Removed ability to restart
                     pass
                 elif event.key == self.pygame.K_SPACE:
-                    self.player["action"] = PlayerAction.ATTACK
+                    self.player.action = PlayerAction.ATTACK
                     self.check_attack()
                 ## Debug mode toggle
                 elif event.key == self.pygame.K_d and self.pygame.key.get_mods() & self.pygame.KMOD_CTRL:
-                    self.debug_mode = not self.debug_mode
+                    self._set_debug_mode(not self.debug_mode)
                     print(f"Debug mode {'enabled' if self.debug_mode else 'disabled'}")
                 ## Debug keys in debug mode
                 elif self.debug_mode and event.key == self.pygame.K_o:
@@ -803,48 +1371,49 @@ class Game:
                     print("DEBUG: Door opened")
                 elif self.debug_mode and event.key == self.pygame.K_1:
                     self.current_room = 1
-                    self.player["x"] = self.rooms[1]["x"] + ROOM_WIDTH // 2
-                    self.player["y"] = self.rooms[1]["y"] + ROOM_HEIGHT // 2
+                    self.player.x = self.rooms[1]["x"] + ROOM_WIDTH // 2
+                    self.player.y = self.rooms[1]["y"] + ROOM_HEIGHT // 2
                     print("DEBUG: Moved to room 1")
                 elif self.debug_mode and event.key == self.pygame.K_2:
                     self.current_room = 2
-                    self.player["x"] = self.rooms[2]["x"] + ROOM_WIDTH // 2
-                    self.player["y"] = self.rooms[2]["y"] + ROOM_HEIGHT // 2
+                    self.player.x = self.rooms[2]["x"] + ROOM_WIDTH // 2
+                    self.player.y = self.rooms[2]["y"] + ROOM_HEIGHT // 2
                     print("DEBUG: Moved to room 2")
             elif event.type == self.pygame.KEYUP:
                 if event.key == self.pygame.K_SPACE:
                     ## Only change from attack if space is released
-                    if self.player["action"] == PlayerAction.ATTACK:
-                        self.player["action"] = PlayerAction.IDLE
+                    if self.player.action == PlayerAction.ATTACK:
+                        self.player.action = PlayerAction.IDLE
         
         ## Handle continuous key presses
-        keys = self.pygame.key.get_pressed()
-        old_x, old_y = self.player["x"], self.player["y"]
-        moved = False
-        
-        if keys[self.pygame.K_w] or keys[self.pygame.K_UP]:
-            self.player["y"] -= self.player["speed"]
-            moved = True
-        if keys[self.pygame.K_s] or keys[self.pygame.K_DOWN]:
-            self.player["y"] += self.player["speed"]
-            moved = True
-        if keys[self.pygame.K_a] or keys[self.pygame.K_LEFT]:
-            self.player["x"] -= self.player["speed"]
-            moved = True
-        if keys[self.pygame.K_d] or keys[self.pygame.K_RIGHT]:
-            self.player["x"] += self.player["speed"]
-            moved = True
+        keys = self._pg_key_get_pressed()
+        old_x, old_y = self.player.x, self.player.y
+        key_w, key_up = self._keys_up
+        key_s, key_down = self._keys_down
+        key_a, key_left = self._keys_left
+        key_d, key_right = self._keys_right
+        
+        ## Pack the four directions into a bitmask and look the step up once
+        bits = ((keys[key_w] or keys[key_up])
+                | (keys[key_s] or keys[key_down]) << 1
+                | (keys[key_a] or keys[key_left]) << 2
+                | (keys[key_d] or keys[key_right]) << 3)
+        moved = bits != 0
+        if moved:
+            dx, dy = MOVE_TABLE[bits]
+            self.player.x += dx * self.player.speed
+            self.player.y += dy * self.player.speed
         
         ## Update player action state
-        if moved and self.player["action"] != PlayerAction.ATTACK:
-            self.player["action"] = PlayerAction.MOVE
-        elif not moved and self.player["action"] != PlayerAction.ATTACK:
-            self.player["action"] = PlayerAction.IDLE
+        if moved and self.player.action != PlayerAction.ATTACK:
+            self.player.action = PlayerAction.MOVE
+        elif not moved and self.player.action != PlayerAction.ATTACK:
+            self.player.action = PlayerAction.IDLE
         
         ## Check if player's new position is valid (not inside an obstacle)
-        if not self.is_valid_move(self.player["x"], self.player["y"], PLAYER_SIZE):
+        if not self.is_valid_move(self.player.x, self.player.y, PLAYER_SIZE):
             # If not valid, revert to old position
-            self.player["x"], self.player["y"] = old_x, old_y
+            self.player.x, self.player.y = old_x, old_y
         
         ## Special door handling - check if player is trying to go through the door
         at_door = self.is_player_at_door()
@@ -854,387 +1423,160 @@ class Game:
             self.check_door_interaction()
         else:
             ## Normal boundary checking - only if we're not going through the door
-            current_room = self.rooms[self.current_room]
-            self.player["x"] = max(current_room["x"] + PLAYER_SIZE//2, 
-                                 min(self.player["x"], current_room["x"] + current_room["width"] - PLAYER_SIZE//2))
-            self.player["y"] = max(current_room["y"] + PLAYER_SIZE//2, 
-                                 min(self.player["y"], current_room["y"] + current_room["height"] - PLAYER_SIZE//2))
+            player = self.player
+            rx0, rx1, ry0, ry1 = self._player_bounds[self.current_room]
+            if player.x < rx0:
+                player.x = rx0
+            elif player.x > rx1:
+                player.x = rx1
+            if player.y < ry0:
+                player.y = ry0
+            elif player.y > ry1:
+                player.y = ry1
     
     def draw_start_screen(self):
+        self._presented_bg = None
         self.screen.fill(BLACK)
         
-        ## Draw pixel art title with necessary information
-        emotion_type = self.emotion_system.get_system_type().name.replace('_', ' ').title()
-        title_text = self.large_font.render(f"NPC EMOTION GAME!", True, PIXEL_YELLOW)
-        title_rect = title_text.get_rect(center=(WIDTH//2, HEIGHT//4))
-        shadow_rect = title_rect.copy()
-        shadow_rect.x += 3
-        shadow_rect.y += 3
-        
-        ## Draw shadow first then text
-        shadow_text = self.large_font.render(f"NPC EMOTION GAME!", True, PIXEL_DARK_GRAY)
-        self.screen.blit(shadow_text, shadow_rect)
-        self.screen.blit(title_text, title_rect)
-        
-        ## Get condition-specific description
-        description = self.emotion_system.get_description()
-        
-        instructions = [
-            "You are an explorer in a dungeon, accompanied by an NPC companion.",
-            description,
-            "",
-            "OBJECTIVES:",
-            "• Collect all 4 resources (yellow squares)",
-            "• Defeat 8 enemies (red circles)",
-            "• Collect 2 resources in Room 1 to open the door",
-            "• Reach the exit in Room 2 after completing all objectives",
-            "",
-            "CONTROLS:",
-            "WASD or Arrow Keys: Move",
-            "SPACE: Attack (must be close to enemy)",
-            "",
-            "Press ENTER or SPACE to start"
-        ]
-        
-        y_pos = HEIGHT//3
-        for instruction in instructions:
-            if instruction.startswith("OBJECTIVES:") or instruction.startswith("CONTROLS:"):
-                text = self.font.render(instruction, True, PIXEL_YELLOW)
-                y_pos += 10
-            elif instruction == "":
-                y_pos += 15
-            else:
-                text = self.small_font.render(instruction, True, WHITE)
-            
-            if instruction != "":
-                text_rect = text.get_rect(center=(WIDTH//2, y_pos))
-                self.screen.blit(text, text_rect)
-            
-            y_pos += 30
+        ## Draw shadow first then title, then the instructions --> all rendered once in _build_static_surfaces
+        self.screen.blit(self._title_shadow_surf, self._title_shadow_rect)
+        self.screen.blit(self._title_surf, self._title_rect)
+        for text, text_rect in self._instruction_surfs:
+            self.screen.blit(text, text_rect)
         
         ## Show participant ID 
-        if self.participant_id:
-            id_text = self.small_font.render(f"Participant ID: {self.participant_id}", True, WHITE)
-            id_rect = id_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 20))
-            self.screen.blit(id_text, id_rect)
-        
-            ## Only show condition if debug info is enabled
-            if hasattr(self, 'show_debug_info') and self.show_debug_info:
-                condition_text = self.small_font.render(f"Condition: {self.condition}", True, WHITE)
-                condition_rect = condition_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 45))
-                self.screen.blit(condition_text, condition_rect)
+        for text, text_rect in self._participant_surfs:
+            self.screen.blit(text, text_rect)
         
-        self.pygame.display.flip()
+        self._flip()
     
     def draw_completed_screen(self):
+        self._presented_bg = None
+        self._rect_pool_idx = 0
         self.screen.fill(BLACK)
         
-        ## Pixel art completion text
-        completion_text = self.large_font.render("CONGRATULATIONS!", True, PIXEL_GREEN)
-        completion_rect = completion_text.get_rect(center=(WIDTH//2, HEIGHT//3))
-        shadow_rect = completion_rect.copy()
-        shadow_rect.x += 3
-        shadow_rect.y += 3
-        
-        shadow_text = self.large_font.render("CONGRATULATIONS!", True, PIXEL_DARK_GRAY)
-        self.screen.blit(shadow_text, shadow_rect)
-        self.screen.blit(completion_text, completion_rect)
-        
-        message_text = self.font.render("You've successfully completed the game!", True, WHITE)
-        message_rect = message_text.get_rect(center=(WIDTH//2, HEIGHT//3 + 60))
-        self.screen.blit(message_text, message_rect)
+        ## Pixel art completion text, shadow first
+        for text, text_rect in self._completion_surfs:
+            self.screen.blit(text, text_rect)
         
         stats = [
-            f"Resources Collected: {self.player['resources_collected']}/4",
-            f"Enemies Defeated: {self.player['enemies_killed']}/8",
-            f"Final Health: {int(self.player['health'])}/100"
+            f"Resources Collected: {self.player.resources_collected}/4",
+            f"Enemies Defeated: {self.player.enemies_killed}/8",
+            f"Final Health: {int(self.player.health)}/100"
         ]
         
         y_pos = HEIGHT//2
         for stat in stats:
-            text = self.font.render(stat, True, WHITE)
-            text_rect = text.get_rect(center=(WIDTH//2, y_pos))
-            self.screen.blit(text, text_rect)
+            text = self._render_cached(self.font, stat, WHITE)
+            self.screen.blit(text, self._pooled_rect(text, (WIDTH//2, y_pos)))
             y_pos += 40
         
-        ## Show instructions to return to QUualtrics
-        if self.participant_id:
-            continue_text = self.font.render("Please press esc or close the game and return to the survey to continue", True, PIXEL_YELLOW)
-            continue_rect = continue_text.get_rect(center=(WIDTH//2, HEIGHT - 100))
-            self.screen.blit(continue_text, continue_rect)
-            
-            # Show participant ID and condition (only if debug info is enabled)
-            id_text = self.small_font.render(f"Participant ID: {self.participant_id}", True, WHITE)
-            id_rect = id_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 20))
-            self.screen.blit(id_text, id_rect)
-            
-            ## Only show condition if debug info is enabled
-            if hasattr(self, 'show_debug_info') and self.show_debug_info:
-                condition_text = self.small_font.render(f"Condition: {self.condition}", True, WHITE)
-                condition_rect = condition_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 45))
-                self.screen.blit(condition_text, condition_rect)
-        else:
-            
-            restart_text = self.font.render("Press R to play again or ESC to quit", True, PIXEL_YELLOW)
-            restart_rect = restart_text.get_rect(center=(WIDTH//2, HEIGHT - 100))
-            self.screen.blit(restart_text, restart_rect)
+        ## Show instructions to return to QUualtrics, or the restart hint without a participant
+        self.screen.blit(*self._closing_surf)
+        
+        # Show participant ID and condition (only if debug info is enabled)
+        for text, text_rect in self._participant_surfs:
+            self.screen.blit(text, text_rect)
         
-        self.pygame.display.flip()
+        self._flip()
     
     def draw_game(self):
-        self.screen.fill(BLACK)
+        draw = self.pygame.draw
+        screen = self.screen
+        player = self.player
+        npc = self.npc
+        current_room = self.current_room
+        
+        ## Floor, walls, obstacles and the exit never change during a run --> the pre-rendered background
+        ## only has to be restored where something was drawn last frame, unless the screen showed something else
+        background = self._static_bg[current_room]
+        if self._presented_bg is background:
+            for rect in self._prev_dirty_rects:
+                screen.blit(background, rect, rect)
+        else:
+            screen.blit(background, (0, 0))
         
-        ## Draw rooms with pixel art styling
-        for room_id, room in self.rooms.items():
-            if room_id == self.current_room:
-                ## Draw floor for current room
-                floor_rect = self.pygame.Rect(room["x"], room["y"], room["width"], room["height"])
-                self.draw_pixel_rect(self.screen, PIXEL_FLOOR, floor_rect)
-                
-                ## Draw walls with pixel art style
-                wall_thickness = 8
-                
-                ## Top wall
-                top_wall = self.pygame.Rect(room["x"], room["y"], room["width"], wall_thickness)
-                self.draw_pixel_rect(self.screen, PIXEL_WALL, top_wall)
-                
-                ## Bottom wall
-                bottom_wall = self.pygame.Rect(room["x"], room["y"] + room["height"] - wall_thickness, 
-                                        room["width"], wall_thickness)
-                self.draw_pixel_rect(self.screen, PIXEL_WALL, bottom_wall)
-                
-                ## Left wall
-                left_wall = self.pygame.Rect(room["x"], room["y"], wall_thickness, room["height"])
-                self.draw_pixel_rect(self.screen, PIXEL_WALL, left_wall)
-                
-                ## Right wall
-                right_wall = self.pygame.Rect(room["x"] + room["width"] - wall_thickness, room["y"], 
-                                       wall_thickness, room["height"])
-                self.draw_pixel_rect(self.screen, PIXEL_WALL, right_wall)
-            else:
-                ## Draw outline for non-current room
-                self.pygame.draw.rect(self.screen, PIXEL_DARK_GRAY, 
-                               (room["x"], room["y"], room["width"], room["height"]), 3)
+        ## Every rect drawn this frame is recorded so only those regions get presented
+        dirty = self._dirty_rects
+        self._rect_pool_idx = 0
         
-        if self.current_room == 1 or self.current_room == 2:
-            room = self.rooms[self.current_room]
+        if current_room == 1 or current_room == 2:
+            room = self.rooms[current_room]
             
-            ## Draw obstacles in the current room
-            for obs_x, obs_y in self.obstacles[self.current_room]:
-                obstacle_rect = self.pygame.Rect(obs_x - OBSTACLE_SIZE//2, obs_y - OBSTACLE_SIZE//2, 
-                                          OBSTACLE_SIZE, OBSTACLE_SIZE)
-                self.draw_pixel_rect(self.screen, PIXEL_OBSTACLE, obstacle_rect, border_radius=3)
+            ## Snapshot positions as ints once --> physics keeps floats, every draw call below gets int pixels
+            player_pos = (int(player.x), int(player.y))
+            npc_pos = (int(npc.x), int(npc.y))
+            bubble_pos = (npc_pos[0], npc_pos[1] - 35)
             
-            ## Draw resources
-            for resource in self.resources:
-                if resource["room"] == self.current_room and not resource["collected"]:
-                    resource_rect = self.pygame.Rect(resource["x"] - RESOURCE_SIZE/2, 
-                                             resource["y"] - RESOURCE_SIZE/2, 
-                                             RESOURCE_SIZE, RESOURCE_SIZE)
-                    self.draw_pixel_rect(self.screen, PIXEL_YELLOW, resource_rect)
+            ## Draw resources --> sprite and top-left offset looked up once, not per resource
+            resource_sprite = self.sprites["resource"]
+            resource_offset = RESOURCE_SIZE//2 + 1
+            for i in self.active_resources():
+                dirty.append(screen.blit(resource_sprite, (int(self.resource_x[i]) - resource_offset, int(self.resource_y[i]) - resource_offset)))
             
             ## Draw enemies
-            for enemy in self.enemies:
-                if enemy["room"] == self.current_room and enemy["alive"]:
-                    self.draw_pixel_circle(self.screen, PIXEL_RED, 
-                                    (int(enemy["x"]), int(enemy["y"])), 
-                                    ENEMY_SIZE//2)
-                    
-                    ## Draw health bar for enemies in debug mode
-                    if self.debug_mode:
-                        health_width = ENEMY_SIZE * (enemy["health"] / 100)
-                        self.pygame.draw.rect(self.screen, RED, 
-                                        (int(enemy["x"] - ENEMY_SIZE/2), 
-                                         int(enemy["y"] - ENEMY_SIZE/2 - 8), 
-                                         ENEMY_SIZE, 5))
-                        self.pygame.draw.rect(self.screen, GREEN, 
-                                        (int(enemy["x"] - ENEMY_SIZE/2), 
-                                         int(enemy["y"] - ENEMY_SIZE/2 - 8), 
-                                         health_width, 5))
+            active = self.active_enemies()
+            enemy_sprite = self.sprites["enemy"]
+            for i in active:
+                dirty.append(self._blit_circle_sprite(enemy_sprite, (int(self.enemy_x[i]), int(self.enemy_y[i]))))
             
-            ## Draw exit in room 2
-            if self.current_room == 2:
-                ## Draw exit with frame and glow effect
-                exit_rect = self.pygame.Rect(self.exit["x"], self.exit["y"], 
-                                      self.exit["width"], self.exit["height"])
-                
-                ## Draw a subtle glow/halo effect around the exit
-                for i in range(3):
-                    glow_rect = self.pygame.Rect(
-                        self.exit["x"] - i*2, 
-                        self.exit["y"] - i*2,
-                        self.exit["width"] + i*4, 
-                        self.exit["height"] + i*4
-                    )
-                    glow_color = (min(255, PIXEL_GREEN[0] + 20), 
-                                min(255, PIXEL_GREEN[1] + 20), 
-                                min(255, PIXEL_GREEN[2] + 20), 
-                                100 - i*30) 
-                    
-                    s = self.pygame.Surface((glow_rect.width, glow_rect.height), self.pygame.SRCALPHA)
-                    self.pygame.draw.rect(s, glow_color, (0, 0, glow_rect.width, glow_rect.height))
-                    self.screen.blit(s, (glow_rect.x, glow_rect.y))
-                
-                ## Draw the actual exit
-                self.draw_pixel_rect(self.screen, PIXEL_GREEN, exit_rect)
-                
-                ## Add "EXIT" text
-                exit_text = self.small_font.render("EXIT", True, BLACK)
-                exit_text_rect = exit_text.get_rect(center=(
-                    self.exit["x"] + self.exit["width"]//2,
-                    self.exit["y"] + self.exit["height"]//2
-                ))
-                self.screen.blit(exit_text, exit_text_rect)
+            ## Draw health bar for enemies in debug mode --> picked in _set_debug_mode, no per-enemy branch
+            self._draw_enemy_debug(screen, active, dirty)
             
             ## Draw player and NPC with pixel art style
-            self.draw_pixel_circle(self.screen, PIXEL_BLUE, 
-                            (int(self.player["x"]), int(self.player["y"])), 
-                            PLAYER_SIZE//2)
-            
-            self.draw_pixel_circle(self.screen, PIXEL_GREEN, 
-                            (int(self.npc["x"]), int(self.npc["y"])), 
-                            NPC_SIZE//2)
-            
-            ## Room-specific emotion symbols for ML condition
-            if self.emotion_system.get_system_type() == EmotionSystem.MACHINE_LEARNING:
-                if self.current_room == 1:
-                    emotion_symbols = {
-                        NPCEmotion.ANTICIPATION: "...",
-                        NPCEmotion.HAPPINESS: ":)",
-                        NPCEmotion.FEAR: "!!",
-                        NPCEmotion.ANGER: "!!",
-                        NPCEmotion.SURPRISE: "?!",
-                        NPCEmotion.SADNESS: ":("
-                    }
-                else:  # Room 2
-                    emotion_symbols = {
-                        NPCEmotion.ANTICIPATION: "..?",
-                        NPCEmotion.HAPPINESS: ":D",
-                        NPCEmotion.FEAR: "??",
-                        NPCEmotion.ANGER: ">:(",
-                        NPCEmotion.SURPRISE: ":O",
-                        NPCEmotion.SADNESS: ":'("
-                    }
-            else:
-                ## Standard emotion symbols for non-ML conditions
-                emotion_symbols = {
-                    NPCEmotion.ANTICIPATION: "...",
-                    NPCEmotion.HAPPINESS: ":)",
-                    NPCEmotion.FEAR: "!!",
-                    NPCEmotion.ANGER: "!!",
-                    NPCEmotion.SURPRISE: "?!",
-                    NPCEmotion.SADNESS: ":("
-                }
+            dirty.append(self._blit_circle_sprite(self.sprites["player"], player_pos))
+            dirty.append(self._blit_circle_sprite(self.sprites["npc"], npc_pos))
             
-            emotion_color = {
-                NPCEmotion.ANTICIPATION: PIXEL_YELLOW,
-                NPCEmotion.HAPPINESS: PIXEL_GREEN,
-                NPCEmotion.FEAR: WHITE,
-                NPCEmotion.ANGER: PIXEL_RED,
-                NPCEmotion.SURPRISE: PIXEL_PURPLE,
-                NPCEmotion.SADNESS: PIXEL_BLUE
-            }
+            ## Room-specific emotion symbols for ML condition, standard ones otherwise
+            emotion_text = self._emotion_symbol_surfs[current_room][npc.emotion]
             
             ## Draw emotion bubble with pixel art style
             bubble_radius = 20
-            self.pygame.draw.circle(self.screen, WHITE, 
-                             (int(self.npc["x"]), int(self.npc["y"] - 35)), 
-                             bubble_radius)
-            self.pygame.draw.circle(self.screen, PIXEL_GRAY, 
-                             (int(self.npc["x"]), int(self.npc["y"] - 35)), 
-                             bubble_radius, 1)
+            dirty.append(draw.circle(screen, WHITE, 
+                             bubble_pos, 
+                             bubble_radius))
+            dirty.append(draw.circle(screen, PIXEL_GRAY, 
+                             bubble_pos, 
+                             bubble_radius, 1))
             
-            emotion_text = self.small_font.render(emotion_symbols[self.npc["emotion"]], True, emotion_color[self.npc["emotion"]])
-            emotion_rect = emotion_text.get_rect(center=(int(self.npc["x"]), int(self.npc["y"] - 35)))
-            self.screen.blit(emotion_text, emotion_rect)
+            emotion_rect = self._pooled_rect(emotion_text, bubble_pos)
+            dirty.append(screen.blit(emotion_text, emotion_rect))
             
-            ## Room-specific reaction visuals for ML condition
-            if self.emotion_system.get_system_type() == EmotionSystem.MACHINE_LEARNING:
-                ## Draw NPC reactions with room-specific styles
-                if self.npc["reaction"] == NPCReaction.NOTIFY_RESOURCE:
-                    nearest_resource = None
-                    min_distance = float('inf')
-                    for resource in self.resources:
-                        if resource["room"] == self.current_room and not resource["collected"]:
-                            distance = math.sqrt((self.npc["x"] - resource["x"])**2 + (self.npc["y"] - resource["y"])**2)
-                            if distance < min_distance:
-                                min_distance = distance
-                                nearest_resource = resource
-                    if nearest_resource:
-                        ## Use simple line for both rooms
-                        self.pygame.draw.line(self.screen, PIXEL_YELLOW, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    (int(nearest_resource["x"]), int(nearest_resource["y"])),
-                                    2)
-                
-                elif self.npc["reaction"] == NPCReaction.NOTIFY_DANGER:
-                    ## Simple text for both rooms
-                    danger_text = self.small_font.render("DANGER", True, PIXEL_RED)
-                    self.screen.blit(danger_text, (int(self.npc["x"]) + 20, int(self.npc["y"]) - 15))
-                
-                elif self.npc["reaction"] == NPCReaction.ATTACK_ENEMY:
-                    ## Simple red circle for both rooms
-                    self.pygame.draw.circle(self.screen, PIXEL_RED, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    NPC_SIZE, 2)
-                
-                elif self.npc["reaction"] == NPCReaction.PROVIDE_HEALING:
-                    ## Simple green circle for both rooms
-                    self.pygame.draw.circle(self.screen, PIXEL_GREEN, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    NPC_SIZE + 5, 2)
-            else:
-                ## Standard reaction visuals for non-ML conditions
-                if self.npc["reaction"] == NPCReaction.NOTIFY_RESOURCE:
-                    nearest_resource = None
-                    min_distance = float('inf')
-                    for resource in self.resources:
-                        if resource["room"] == self.current_room and not resource["collected"]:
-                            distance = math.sqrt((self.npc["x"] - resource["x"])**2 + (self.npc["y"] - resource["y"])**2)
-                            if distance < min_distance:
-                                min_distance = distance
-                                nearest_resource = resource
-                    if nearest_resource:
-                        self.pygame.draw.line(self.screen, PIXEL_YELLOW, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    (int(nearest_resource["x"]), int(nearest_resource["y"])),
-                                    2)
-                
-                elif self.npc["reaction"] == NPCReaction.NOTIFY_DANGER:
-                    danger_text = self.small_font.render("DANGER", True, PIXEL_RED)
-                    self.screen.blit(danger_text, (int(self.npc["x"]) + 20, int(self.npc["y"]) - 15))
-                
-                elif self.npc["reaction"] == NPCReaction.ATTACK_ENEMY:
-                    self.pygame.draw.circle(self.screen, PIXEL_RED, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    NPC_SIZE, 2)
-                
-                elif self.npc["reaction"] == NPCReaction.PROVIDE_HEALING:
-                    self.pygame.draw.circle(self.screen, PIXEL_GREEN, 
-                                    (int(self.npc["x"]), int(self.npc["y"])),
-                                    NPC_SIZE + 5, 2)
+            ## Draw NPC reactions --> the same visuals in every condition and room
+            if npc.reaction == NPCReaction.NOTIFY_RESOURCE:
+                nearest_resource = self.get_nearest_resource_to_npc()
+                if nearest_resource is not None:
+                    dirty.append(draw.line(screen, PIXEL_YELLOW, 
+                                npc_pos,
+                                (int(self.resource_x[nearest_resource]), int(self.resource_y[nearest_resource])),
+                                2))
+            
+            elif npc.reaction == NPCReaction.NOTIFY_DANGER:
+                danger_text = self._danger_label
+                dirty.append(screen.blit(danger_text, (npc_pos[0] + 20, npc_pos[1] - 15)))
+            
+            elif npc.reaction == NPCReaction.ATTACK_ENEMY:
+                dirty.append(draw.circle(screen, PIXEL_RED, 
+                                npc_pos,
+                                NPC_SIZE, 2))
+            
+            elif npc.reaction == NPCReaction.PROVIDE_HEALING:
+                dirty.append(draw.circle(screen, PIXEL_GREEN, 
+                                npc_pos,
+                                NPC_SIZE + 5, 2))
         
         ## Draw door with pixel art style
         door_color = PIXEL_GREEN if self.door["open"] else PIXEL_RED
-        door_rect = self.pygame.Rect(self.door["x"], self.door["y"], 
-                              self.door["width"], self.door["height"])
+        door_rect = self._door_rect
         
         ## Door unlock effect - persists until player uses the door
-        if hasattr(self, 'door_unlock_effect') and self.door_unlock_effect:
+        if self.door_unlock_effect:
             ## Create a pulsing/glowing effect around the door
             glow_size = 10 + int(5 * math.sin(self.frame * 0.2))
-            glow_rect = self.pygame.Rect(
-                door_rect.x - glow_size, 
-                door_rect.y - glow_size,
-                door_rect.width + glow_size*2, 
-                door_rect.height + glow_size*2
-            )
             
-            ## Create a semi-transparent surface for the glow
-            s = self.pygame.Surface((glow_rect.width, glow_rect.height), self.pygame.SRCALPHA)
-            glow_color = (PIXEL_GREEN[0], PIXEL_GREEN[1], PIXEL_GREEN[2], 150)  # Semi-transparent green
-            self.pygame.draw.rect(s, glow_color, (0, 0, glow_rect.width, glow_rect.height), border_radius=5)
-            self.screen.blit(s, (glow_rect.x, glow_rect.y))
+            ## Semi-transparent surface for the glow, cached per size
+            s = _glow_surface(DOOR_GLOW_COLOR, door_rect.width + glow_size*2, door_rect.height + glow_size*2, 5)
+            dirty.append(screen.blit(s, (door_rect.x - glow_size, door_rect.y - glow_size)))
         
             if self.door_unlock_timer > 0:
                 self.door_unlock_timer -= 1
@@ -1242,137 +1584,178 @@ class Game:
                     self.door_unlock_effect = False
         
         ## Draw the door
-        self.draw_pixel_rect(self.screen, door_color, door_rect)
-        self.draw_pixel_rect(self.screen, PIXEL_DOOR, door_rect, 3)  # Door frame
+        dirty.append(self.draw_pixel_rect(screen, door_color, door_rect))
+        dirty.append(self.draw_pixel_rect(screen, PIXEL_DOOR, door_rect, 3))  # Door frame
         
         ## Add text indicator
-        door_text = self.small_font.render("DOOR", True, BLACK)
-        door_text_rect = door_text.get_rect(center=(
-            self.door["x"] + self.door["width"]//2,
-            self.door["y"] + self.door["height"]//2
-        ))
-        self.screen.blit(door_text, door_text_rect)
+        dirty.append(screen.blit(self._door_label, self._door_label_rect))
         
         ## Draw UI elements with pixel art styling
-        ## Health bar
-        health_border = self.pygame.Rect(20, 20, 200, 30)
-        health_fill = self.pygame.Rect(20, 20, int(self.player["health"] * 2), 30)
-        
-        ## Draw health bar background and fill
-        self.draw_pixel_rect(self.screen, PIXEL_RED, health_border)
-        self.draw_pixel_rect(self.screen, PIXEL_GREEN, health_fill)
-        
-        health_text = self.font.render(f"Health: {int(self.player['health'])}", True, WHITE)
-        self.screen.blit(health_text, (25, 25))
-        
-        ## Room indicator
-        room_text = self.font.render(f"Room {self.current_room}", True, WHITE)
-        self.screen.blit(room_text, (WIDTH - 120, 25))
-        
-        ## Draw progress indicators at the top right
-        resources_text = self.small_font.render(f"Resources: {self.player['resources_collected']}/4", True, PIXEL_YELLOW)
-        self.screen.blit(resources_text, (WIDTH - 200, 60))
-        
-        enemies_text = self.small_font.render(f"Enemies: {self.player['enemies_killed']}/8", True, PIXEL_RED)
-        self.screen.blit(enemies_text, (WIDTH - 200, 85))
+        ## The HUD texts only change with the values they show --> rebuilt when one of them changes,
+        ## otherwise the entries of the last rebuild are reused without any formatting or lookups
+        health = int(player.health)
+        fill_width = int(player.health * 2)
+        door_open = self.door["open"]
+        hud_state = (fill_width, health, current_room, player.resources_collected, player.enemies_killed, door_open)
+        if hud_state != self._hud_state:
+            self._hud_state = hud_state
+            
+            ## Health bar
+            health_bar = self._health_bar_surfs.get(fill_width)
+            if health_bar is None:
+                health_bar = self._health_bar_surfs[fill_width] = self._render_health_bar(fill_width)
+            
+            ## Health bar background and fill are a single surface
+            self._hud_entries = [
+                (health_bar, (20 - PIXEL_RECT_PAD, 20 - PIXEL_RECT_PAD)),
+                (self._render_cached(self.font, f"Health: {health}", WHITE), HUD_HEALTH_POS),
+                
+                ## Room indicator
+                (self._render_cached(self.font, f"Room {current_room}", WHITE), HUD_ROOM_POS),
+                
+                ## Draw progress indicators at the top right
+                (self._render_cached(self.small_font, f"Resources: {player.resources_collected}/4", PIXEL_YELLOW), HUD_RESOURCES_POS),
+                (self._render_cached(self.small_font, f"Enemies: {player.enemies_killed}/8", PIXEL_RED), HUD_ENEMIES_POS),
+                
+                ## Draw door status indicator
+                (self._render_cached(self.small_font, "Door: OPEN" if door_open else "Door: LOCKED",
+                                     PIXEL_GREEN if door_open else PIXEL_RED), HUD_DOOR_POS)
+            ]
         
-        ## Draw door status indicator
-        door_status = "OPEN" if self.door["open"] else "LOCKED"
-        door_color = PIXEL_GREEN if self.door["open"] else PIXEL_RED
-        door_text = self.small_font.render(f"Door: {door_status}", True, door_color)
-        self.screen.blit(door_text, (WIDTH // 2 - 40, 25))
+        ## HUD surfaces are collected in draw order and blitted in one batched call
+        hud = self._hud_entries.copy()
         
         ## Draw timer (if enabled)
-        if hasattr(self, 'game_time_limit') and self.game_time_limit > 0:
-            seconds_left = max(0, self.game_time_limit - (self.frame / FPS))
-            minutes = int(seconds_left // 60)
-            seconds = int(seconds_left % 60)
-            timer_text = self.small_font.render(f"Time: {minutes}:{seconds:02d}", True, WHITE)
-            self.screen.blit(timer_text, (WIDTH - 120, 115))
+        if self._has_time_limit:
+            ## Whole seconds left in integer arithmetic, re-rendered only when the second changes
+            whole_sec = max(0, self._time_limit_ms - self._elapsed_ms) // 1000
+            if whole_sec != self._last_timer_sec:
+                minutes, seconds = divmod(whole_sec, 60)
+                self._last_timer_surf = self._render_cached(self.small_font, f"Time: {minutes}:{seconds:02d}", WHITE)
+                self._last_timer_sec = whole_sec
+            hud.append((self._last_timer_surf, HUD_TIMER_POS))
             
-        ## Draw emotion and reaction info if debug info is enabled
-        if self.show_debug_info:
-            emotion_debug_text = self.small_font.render(f"Emotion: {self.npc['emotion'].value}", True, WHITE)
-            reaction_debug_text = self.small_font.render(f"Reaction: {self.npc['reaction'].value}", True, WHITE)
-            self.screen.blit(emotion_debug_text, (25, 120))
-            self.screen.blit(reaction_debug_text, (25, 145))
+        ## Draw emotion and reaction info if debug info is enabled --> empty otherwise
+        hud.extend(self._npc_debug_hud)
         
         ## Show participant ID
-        if self.participant_id:
-            id_text = self.small_font.render(f"Participant ID: {self.participant_id}", True, WHITE)
-            id_rect = id_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 20))
-            self.screen.blit(id_text, id_rect)
-            
-            ## Only show condition if debug info is enabled
-            if hasattr(self, 'show_debug_info') and self.show_debug_info:
-                condition_text = self.small_font.render(f"Condition: {self.condition}", True, WHITE)
-                condition_rect = condition_text.get_rect(bottomright=(WIDTH - 20, HEIGHT - 45))
-                self.screen.blit(condition_text, condition_rect)
+        hud.extend(self._participant_surfs)
         
-        ## Update display
-        self.pygame.display.flip()
+        ## blits returns the drawn rects, which the dirty-rect update needs --> fblits would not
+        dirty.extend(screen.blits(hud))
+        
+        ## Update display --> what was drawn now plus what was drawn last frame (now background again)
+        ## Many or large rects cost more than pushing the whole window, so fall back to flip then
+        update_rects = self._prev_dirty_rects + dirty
+        if (self._presented_bg is background and len(update_rects) <= DIRTY_RECT_MAX
+                and sum(rect.w * rect.h for rect in update_rects) <= DIRTY_AREA_MAX):
+            self._display_update(update_rects)
+        else:
+            self._flip()
+            self._presented_bg = background
+        self._prev_dirty_rects, self._dirty_rects = dirty, self._prev_dirty_rects
+        self._dirty_rects.clear()
     
     def update(self):
-        if self.state == GameState.START_SCREEN:
-            self.handle_start_screen_events()
-            self.draw_start_screen()
-        elif self.state == GameState.COMPLETED:
-            self.handle_completed_screen_events()
-            self.draw_completed_screen()
-        elif self.state == GameState.PLAYING:
-            ## Increment frame counter
-            self.frame += 1
-            
-            ## Save the previous action for the emotion prediction
-            self.lagged_player_action = self.player["action"]
-            
-            ## Handle user input
-            self.handle_playing_events()
-            
-            ## Update game state
+        ## One dict lookup per frame instead of the state if/elif chain
+        self._state_handlers[self.state]()
+    
+    def _update_start_screen(self):
+        self.handle_start_screen_events()
+        self.draw_start_screen()
+    
+    def _update_completed(self):
+        self.handle_completed_screen_events()
+        self.draw_completed_screen()
+    
+    def _update_playing(self):
+        ## Increment frame counter
+        self.frame += 1
+        
+        ## Elapsed play time of this run, read once per frame
+        now = self._get_ticks()
+        if self._start_ticks is None:
+            self._start_ticks = now
+        self._elapsed_ms = now - self._start_ticks
+        
+        ## Save the previous action for the emotion prediction
+        self.lagged_player_action = self.player.action
+        
+        ## Handle user input
+        self.handle_playing_events()
+        
+        ## Update game state
+        self._rebuild_enemy_grid()
+        
+        ## Emotions change on a human timescale --> re-evaluate them only every few frames
+        if self.frame % self._emotion_interval == 0:
             self.update_npc_emotion()
-            self.update_npc_position()
-            self.update_enemies()
-            self.check_resource_collection()
-            self.check_exit_interaction()
-            
-            # Draw the game
-            self.draw_game()
+        self.update_npc_position()
+        self.update_enemies()
+        self.check_resource_collection()
+        self.check_exit_interaction()
+        
+        # Draw the game
+        self.draw_game()
+        
+        ## Check game over conditions
+        if self.player.health <= 0:
+            self._dbg("Game over! Player died.")
+            self.reset()
             
-            ## Check game over conditions
-            if self.player["health"] <= 0:
-                if self.debug_mode:
-                    print("Game over! Player died.")
-                self.reset()
-                
-            ## Check time limit if enabled
-            if hasattr(self, 'game_time_limit') and self.game_time_limit > 0:
-                if self.frame >= self.game_time_limit * FPS:
-                    if self.debug_mode:
-                        print("Time's up!")
-                    self.state = GameState.COMPLETED
+        ## Check time limit if enabled
+        if self._has_time_limit:
+            if self._elapsed_ms >= self._time_limit_ms:
+                self._dbg("Time's up!")
+                self.state = GameState.COMPLETED
     
     def run(self):
         ## Main game run
         emotion_system_type = self.emotion_system.get_system_type().name.replace('_', ' ').title()
         print(f"Game started! {emotion_system_type} NPC emotions with Pixel Art style")
         
-        ## Main game loop
-        while self.running:
-            self.clock.tick(FPS)
-            self.update()
+        ## Keep automatic GC passes out of the frame loop --> everything allocated so far is frozen out of
+        ## the collector, which then runs on a fixed interval instead of whenever allocations pile up
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        last_gc = self.pygame.time.get_ticks()
+        
+        ## Main game loop --> the per-frame calls are bound once outside of it
+        tick = self.clock.tick
+        update = self.update
+        get_ticks = self.pygame.time.get_ticks
+        try:
+            while self.running:
+                tick(FPS)
+                update()
+                now = get_ticks()
+                if self._log_buf and now - self._last_log_flush >= DEBUG_LOG_FLUSH_MS:
+                    self._flush_debug_log()
+                if now - last_gc >= GC_INTERVAL_MS:
+                    gc.collect()
+                    last_gc = now
+        finally:
+            self._flush_debug_log()
+            
+            ## Hand the collector back to the launcher
+            gc.enable()
+            gc.unfreeze()
+            
+            ## Close the window in study mode too, even if the loop raised --> the next Game re-initializes pygame
+            self.pygame.quit()
         
-        ## Before closing, gather and return game data if in a study
-        if self.participant_id:
-            ## Return game data for the study
-            return {
-                'participant_id': self.participant_id,
-                'condition': self.condition,
-                'resources_collected': self.player['resources_collected'],
-                'enemies_killed': self.player['enemies_killed'],
-                'health': int(self.player['health']),
-                'completed': self.state == GameState.COMPLETED,
-                'play_time': self.frame / FPS, 
-            }
-        
-        self.pygame.quit()
\ No newline at end of file
+        ## Gather and return game data if in a study
+        return self._collect_result() if self.participant_id else None
+    
+    def _collect_result(self):
+        ## Game data for the study
+        return {
+            'participant_id': self.participant_id,
+            'condition': self.condition,
+            'resources_collected': self.player.resources_collected,
+            'enemies_killed': self.player.enemies_killed,
+            'health': int(self.player.health),
+            'completed': self.state == GameState.COMPLETED,
+            'play_time': self._elapsed_ms / 1000, 
+        }
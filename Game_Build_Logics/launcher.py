@@ -5,33 +5,113 @@ import random
 import tkinter as tk
 from tkinter import ttk, messagebox
 import webbrowser
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import unquote_plus
 import hashlib
 import base64
+import traceback
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
 
-## Attempt to fix XGBoost VERSION file before importing anything else
-try:
-    from xgboost_VERSION_fix import fix_xgboost_version
-    fix_xgboost_version()
-except ImportError:
-    print("XGBoost VERSION fix module not found")
-
-## Import game components
+## Import game components --> the ML condition is imported on first use, see _ml_emotion_system
 from game_engine import Game, EmotionSystem
 from emotion_systems.random_emotion import RandomEmotionSystem
 from emotion_systems.rule_based_emotion import RuleBasedEmotionSystem
-from emotion_systems.ml_emotion import MLEmotionSystem
 
 ## Constants
 DATA_FOLDER = "data"
 CONFIG_FILE = "config.json"
 COMPLETION_FILE = "completion_status.json"
+CONFIG_PATH = os.path.join(DATA_FOLDER, CONFIG_FILE)
+COMPLETION_PATH = os.path.join(DATA_FOLDER, COMPLETION_FILE)
 DEFAULT_TIME_LIMIT = 120  
 VERIFICATION_CODE_LENGTH = 6 
+ML_PRELOAD_DELAY_MS = 500  ## Launcher is drawn and idle by then
+BASE64_SYMBOLS = str.maketrans("", "", "+/=")  ## the only base64 characters that are not alphanumeric
+
+## Fixed game version -> condition order, shared read-only --> copied with dict() wherever it is saved to JSON
+FIXED_SEQUENCE = MappingProxyType({"1": "random", "2": "rule_based", "3": "ml"})
+FIXED_CONDITIONS = ("random", "rule_based", "ml")
+CONDITION_TO_VERSION = MappingProxyType({cond: ver for ver, cond in FIXED_SEQUENCE.items()})
+## Version keys and the mapping key of a completion entry --> source literals are already interned,
+## so one shared name per key is enough for identity-fast dict lookups
+VERSIONS = tuple(FIXED_SEQUENCE)
+SEQ_KEY = "version_sequence"
+
+## Verification code for one (salt, participant, version, condition) --> pure, so repeated codes are memoized
+@lru_cache(maxsize=512)
+def _verification_code(salt, participant_id, version, condition):
+    ## Create a string to hash
+    input_string = f"{salt}:{participant_id}:{version}:{condition}"
+    
+    ## Create a hash
+    hash_obj = hashlib.sha256(input_string.encode())
+    hash_bytes = hash_obj.digest()
+    
+    ## Convert to base64 and take first VERIFICATION_CODE_LENGTH characters
+    code_full = base64.b64encode(hash_bytes).decode('utf-8')
+    
+    ## Remove the non-alphanumeric base64 symbols in one C-level pass and take the first VERIFICATION_CODE_LENGTH
+    code = code_full.translate(BASE64_SYMBOLS)[:VERIFICATION_CODE_LENGTH]
+    
+    ## Make sure the code is in uppercase for better readability
+    return code.upper()
+
+## ML emotion system class, imported shortly after the launcher is shown (or on the first ML launch)
+_ml_system_class = None
+
+def _ml_emotion_class():
+    ## The XGBoost VERSION fix and the ML module import (joblib, model code) stay off the launcher start-up
+    global _ml_system_class
+    if _ml_system_class is None:
+        ## Attempt to fix XGBoost VERSION file before importing the ML system
+        try:
+            from xgboost_VERSION_fix import fix_xgboost_version
+            fix_xgboost_version()
+        except ImportError:
+            print("XGBoost VERSION fix module not found")
+        
+        from emotion_systems.ml_emotion import MLEmotionSystem
+        _ml_system_class = MLEmotionSystem
+    return _ml_system_class
+
+def _ml_emotion_system():
+    return _ml_emotion_class()()
+
+## Emotion system factory for each condition's "system" value
+CONDITION_SYSTEMS = {
+    EmotionSystem.RANDOM.value: RandomEmotionSystem,
+    EmotionSystem.RULE_BASED.value: RuleBasedEmotionSystem,
+    EmotionSystem.MACHINE_LEARNING.value: _ml_emotion_system
+}
+
+## One emotion system per "system" value, shared by every launch --> Game.reset re-initializes it,
+## and the ML system keeps its loaded model between games
+@lru_cache(maxsize=None)
+def _make_system(system_type):
+    make_system = CONDITION_SYSTEMS.get(system_type)
+    return make_system() if make_system is not None else None
+
+## Query parameters of an npcgame:// URL in one pass --> first value per key, blank values dropped like parse_qs
+def _parse_npcgame_url(url):
+    params = {}
+    query = url.partition("#")[0].partition("?")[2]
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if value:
+            params.setdefault(unquote_plus(key), unquote_plus(value))
+    return params
+
+## Replace a file in one step --> a crash mid-write leaves the old file instead of a truncated one
+def _atomic_write_text(path, text):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
 
 ## Define class launcher
 class LauncherApp:
-    def __init__(self, root, admin_mode=False):
+    def __init__(self, root, admin_mode=False, url_arg=None):
         self.root = root
         self.root.title("NPC Emotion Game - Research Study Launcher")
         self.root.geometry("800x650")
@@ -39,20 +119,33 @@ class LauncherApp:
         ## Track if we're in admin mode for testing
         self.admin_mode = admin_mode
         
+        ## npcgame:// URL the launcher was started with, if any
+        self._url_arg = url_arg
+        
         ## Load configuration if it exists
         self.config = self.load_config()
         
+        ## Parsed completion file and the mtime it was read at --> re-parsed only when the file changes
+        self._completion_cache = None
+        self._completion_mtime = None
+        
+        ## Result file names in the data folder and the folder mtime they were listed at
+        self._result_files = frozenset()
+        self._result_files_mtime = None
+        
         ## Create and place widgets
         self.create_widgets()
         
+        ## Import the ML system while the participant ID is typed in --> on the Tk thread, numba's TBB pool
+        ## started from a worker thread hangs the interpreter at exit; the model itself loads when a game starts
+        self.root.after(ML_PRELOAD_DELAY_MS, _ml_emotion_class)
+        
         ## Check for command line arguments
         self.check_command_line_args()
     
     def clean_url(self, url):
         """Clean URL by removing whitespace and newlines"""
-        if url:
-            return url.strip()
-        return url
+        return url.strip() if url else url
     
     def load_config(self):
         """Load configuration from file if exists"""
@@ -67,24 +160,22 @@ class LauncherApp:
             "game_time_limit": DEFAULT_TIME_LIMIT,
             "show_debug_info": False,
             "show_condition_info": False,
-            "version_sequence": {
-                "1": "random",
-                "2": "rule_based",
-                "3": "ml"
-            },
+            "version_sequence": dict(FIXED_SEQUENCE),
             "verification_salt": "NPC_EMOTION_GAME_2024"
         }
         
         ## Create data folder if it doesn't exist
-        if not os.path.exists(DATA_FOLDER):
-            os.makedirs(DATA_FOLDER)
+        os.makedirs(DATA_FOLDER, exist_ok=True)
+        
+        ## Config file contents as last read or written --> save_config skips writes that would not change it
+        self._last_config_blob = None
         
         ## Try to load existing config
-        config_path = os.path.join(DATA_FOLDER, CONFIG_FILE)
-        if os.path.exists(config_path):
+        if os.path.exists(CONFIG_PATH):
             try:
-                with open(config_path, 'r') as f:
-                    saved_config = json.load(f)
+                with open(CONFIG_PATH, 'r') as f:
+                    self._last_config_blob = f.read()
+                    saved_config = json.loads(self._last_config_blob)
                     for key, value in saved_config.items():
                         if key in ["qualtrics_url", "qualtrics_redirect_url"] and value:
                             config[key] = self.clean_url(value)
@@ -98,7 +189,14 @@ class LauncherApp:
             config["verification_salt"] = "NPC_EMOTION_GAME_2024"
         
         ## Ensure version_sequence is always fixed
-        config["version_sequence"] = {"1": "random", "2": "rule_based", "3": "ml"}
+        config["version_sequence"] = dict(FIXED_SEQUENCE)
+        
+        ## Condition lookups by name or description, first listed condition wins --> no scans of the list later
+        self._cond_lookup = {}
+        for cond in config["conditions"]:
+            self._cond_lookup.setdefault(cond["name"], cond)
+            self._cond_lookup.setdefault(cond["description"], cond)
+        self._cond_descs = tuple(cond["description"] for cond in config["conditions"])
         
         ## Save the config
         self.save_config(config)
@@ -117,12 +215,16 @@ class LauncherApp:
             config["qualtrics_redirect_url"] = self.clean_url(config["qualtrics_redirect_url"])
         
         ## Ensure version_sequence is always fixed
-        config["version_sequence"] = {"1": "random", "2": "rule_based", "3": "ml"}
+        config["version_sequence"] = dict(FIXED_SEQUENCE)
+        
+        ## Nothing to write if the file already holds this config (e.g. every startup)
+        blob = json.dumps(config, indent=4)
+        if blob == self._last_config_blob:
+            return True
         
-        config_path = os.path.join(DATA_FOLDER, CONFIG_FILE)
         try:
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=4)
+            _atomic_write_text(CONFIG_PATH, blob)
+            self._last_config_blob = blob
             return True
         except Exception as e:
             print(f"Error saving config: {e}")
@@ -133,51 +235,69 @@ class LauncherApp:
         if not participant_id or not version or not condition:
             return "INVALID"
         
-        ## Get salt from config
+        ## Get salt from config --> part of the memo key, so a changed salt never returns a stale code
         salt = self.config.get("verification_salt", "NPC_EMOTION_GAME_2024")
-        
-        ## Create a string to hash
-        input_string = f"{salt}:{participant_id}:{version}:{condition}"
-        
-        ## Create a hash
-        hash_obj = hashlib.sha256(input_string.encode())
-        hash_bytes = hash_obj.digest()
-        
-        ## Convert to base64 and take first VERIFICATION_CODE_LENGTH characters
-        code_full = base64.b64encode(hash_bytes).decode('utf-8')
-        
-        ## Remove any non-alphanumeric characters and take the first VERIFICATION_CODE_LENGTH
-        code = ''.join(c for c in code_full if c.isalnum())[:VERIFICATION_CODE_LENGTH]
-        
-        ## Make sure the code is in uppercase for better readability
-        return code.upper()
+        return _verification_code(salt, participant_id, version, condition)
+    
+    def _read_completions(self):
+        ## All participants' completion data, {} if the file does not exist yet
+        ## --> parse errors propagate to the caller as before
+        try:
+            mtime = os.stat(COMPLETION_PATH).st_mtime_ns
+        except OSError:
+            self._completion_cache = self._completion_mtime = None
+            return {}
+        
+        if mtime != self._completion_mtime:
+            with open(COMPLETION_PATH, 'r') as f:
+                self._completion_cache = json.load(f)
+            self._completion_mtime = mtime
+        return self._completion_cache
+    
+    def _list_result_files(self):
+        ## Names of the result files in the data folder --> listed again only when files were added or removed
+        try:
+            mtime = os.stat(DATA_FOLDER).st_mtime_ns
+            if mtime != self._result_files_mtime:
+                with os.scandir(DATA_FOLDER) as entries:
+                    self._result_files = frozenset(entry.name for entry in entries if entry.name.startswith("result_"))
+                self._result_files_mtime = mtime
+        except OSError:
+            self._result_files, self._result_files_mtime = frozenset(), None
+        return self._result_files
+    
+    def _write_completions(self, all_completions):
+        ## Write the completion data and keep it as the cached copy --> no re-read after a save
+        try:
+            _atomic_write_text(COMPLETION_PATH, json.dumps(all_completions, indent=4))
+        except Exception:
+            ## The cached dict may hold changes that never reached the file
+            self._completion_mtime = None
+            raise
+        self._completion_cache = all_completions
+        self._completion_mtime = os.stat(COMPLETION_PATH).st_mtime_ns
     
     def randomize_conditions(self):
         ## Return fixed condition order
-        return {"1": "random", "2": "rule_based", "3": "ml"}
+        return FIXED_SEQUENCE
     
     def get_participant_condition_mapping(self, participant_id):
         ## Get condition mapping for this participant
-        fixed_sequence = {"1": "random", "2": "rule_based", "3": "ml"}
-        
         ## If participant ID is provided, store this fixed mapping for them
         if participant_id:
             ## Check if we already have a mapping for this participant
-            completion_path = os.path.join(DATA_FOLDER, COMPLETION_FILE)
-            if os.path.exists(completion_path):
-                try:
-                    with open(completion_path, 'r') as f:
-                        all_completions = json.load(f)
-                        if participant_id in all_completions and "version_sequence" in all_completions[participant_id]:
-                            ## Return existing mapping - fixed
-                            return all_completions[participant_id]["version_sequence"]
-                except Exception as e:
-                    print(f"Error loading condition mapping: {e}")
+            try:
+                all_completions = self._read_completions()
+                if participant_id in all_completions and SEQ_KEY in all_completions[participant_id]:
+                    ## Return existing mapping - fixed
+                    return all_completions[participant_id][SEQ_KEY]
+            except Exception as e:
+                print(f"Error loading condition mapping: {e}")
             
             ## Save the fixed sequence for this participant
-            self.save_participant_condition_mapping(participant_id, fixed_sequence)
+            self.save_participant_condition_mapping(participant_id, dict(FIXED_SEQUENCE))
         
-        return fixed_sequence
+        return FIXED_SEQUENCE
     
     def save_participant_condition_mapping(self, participant_id, version_sequence):
         ## Save the condition mapping for this participant
@@ -185,26 +305,17 @@ class LauncherApp:
             return False
                 
         ## Load current completion data
-        completion_path = os.path.join(DATA_FOLDER, COMPLETION_FILE)
-        all_completions = {}
-        
-        if os.path.exists(completion_path):
-            try:
-                with open(completion_path, 'r') as f:
-                    all_completions = json.load(f)
-            except Exception:
-                all_completions = {}
+        try:
+            all_completions = self._read_completions()
+        except Exception:
+            all_completions = {}
         
         ## Update mapping for this participant
-        if participant_id not in all_completions:
-            all_completions[participant_id] = {"1": False, "2": False, "3": False, "version_sequence": version_sequence}
-        else:
-            all_completions[participant_id]["version_sequence"] = version_sequence
+        all_completions.setdefault(participant_id, dict.fromkeys(VERSIONS, False))[SEQ_KEY] = version_sequence
         
         ## Save back to file
         try:
-            with open(completion_path, 'w') as f:
-                json.dump(all_completions, f, indent=4)
+            self._write_completions(all_completions)
             return True
         except Exception as e:
             print(f"Error saving condition mapping: {e}")
@@ -213,35 +324,31 @@ class LauncherApp:
     def load_completion_status(self, participant_id):
         ## Load participant's completion status
         if not participant_id:
-            return {"1": False, "2": False, "3": False}
+            return dict.fromkeys(VERSIONS, False)
                 
         ## Default status - no games completed
-        status = {"1": False, "2": False, "3": False}
+        status = dict.fromkeys(VERSIONS, False)
         
-        ## Check if the completion status file exists
-        completion_path = os.path.join(DATA_FOLDER, COMPLETION_FILE)
-        if os.path.exists(completion_path):
-            try:
-                with open(completion_path, 'r') as f:
-                    all_completions = json.load(f)
-                    if participant_id in all_completions:
-                        for key, value in all_completions[participant_id].items():
-                            status[key] = value
-            except Exception as e:
-                print(f"Error loading completion status: {e}")
+        ## Check the completion status file (cached while it is unchanged)
+        try:
+            all_completions = self._read_completions()
+            if participant_id in all_completions:
+                for key, value in all_completions[participant_id].items():
+                    status[key] = value
+        except Exception as e:
+            print(f"Error loading completion status: {e}")
         
-        ## Also check for result files to be sure
-        for version in ["1", "2", "3"]:
+        ## Also check for result files to be sure --> one cached directory listing instead of a stat per version
+        result_files = self._list_result_files()
+        for version in VERSIONS:
             ## Get condition from mapping
-            if "version_sequence" in status:
-                condition = status["version_sequence"].get(version, "")
+            if SEQ_KEY in status:
+                condition = status[SEQ_KEY].get(version, "")
             else:
                 ## Fixed sequence if no mapping found
-                fixed_conditions = ["random", "rule_based", "ml"]
-                condition = fixed_conditions[int(version) - 1] if int(version) <= len(fixed_conditions) else ""
+                condition = FIXED_CONDITIONS[int(version) - 1]
                 
-            result_file = os.path.join(DATA_FOLDER, f"result_{participant_id}_{condition}.json")
-            if os.path.exists(result_file):
+            if f"result_{participant_id}_{condition}.json" in result_files:
                 status[version] = True
         
         return status
@@ -252,39 +359,32 @@ class LauncherApp:
             return False
             
         ## Load current completion data
-        completion_path = os.path.join(DATA_FOLDER, COMPLETION_FILE)
-        all_completions = {}
-        
-        if os.path.exists(completion_path):
-            try:
-                with open(completion_path, 'r') as f:
-                    all_completions = json.load(f)
-            except Exception:
-                all_completions = {}
-        
-        ## Update status for this participant
-        if participant_id not in all_completions:
-            ## Create participant entry with fixed condition sequence
-            version_sequence = self.get_participant_condition_mapping(participant_id)
-            all_completions[participant_id] = {"1": False, "2": False, "3": False, "version_sequence": version_sequence}
+        try:
+            all_completions = self._read_completions()
+        except Exception:
+            all_completions = {}
         
-        all_completions[participant_id][version] = completed
+        ## Update status for this participant, creating the entry with the fixed condition sequence if needed
+        ## --> built here and saved with the status, get_participant_condition_mapping would write the file once more
+        entry = all_completions.setdefault(participant_id, {**dict.fromkeys(VERSIONS, False), SEQ_KEY: dict(FIXED_SEQUENCE)})
+        entry[version] = completed
         
         ## Save back to file
         try:
-            with open(completion_path, 'w') as f:
-                json.dump(all_completions, f, indent=4)
+            self._write_completions(all_completions)
             return True
         except Exception as e:
             print(f"Error saving completion status: {e}")
             return False
     
-    def get_next_version(self, participant_id):
-        ## Get the next uncompleted game version for the participant
-        status = self.load_completion_status(participant_id)
+    def get_next_version(self, participant_id, status=None):
+        ## Get the next uncompleted game version for the participant --> callers that already
+        ## loaded the status pass it in, everyone else reads it through the cached completion data
+        if status is None:
+            status = self.load_completion_status(participant_id)
         
         ## Return the first uncompleted version
-        for version in ["1", "2", "3"]:
+        for version in VERSIONS:
             if not status.get(version, False):
                 return version
         
@@ -302,26 +402,17 @@ class LauncherApp:
         title_label.pack(pady=(0, 20))
         
         ## Notebook with tabs
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
         
         ## Create tabs
-        participant_tab = ttk.Frame(notebook)
-        notebook.add(participant_tab, text="Participant Mode")
+        participant_tab = ttk.Frame(self.notebook)
+        self.notebook.add(participant_tab, text="Participant Mode")
         
-        ## Only add test and settings tabs in admin mode
+        ## Only add test and settings tabs in admin mode --> built on first use, hidden and shown again afterwards
+        self._admin_tabs = None
         if self.admin_mode:
-            test_tab = ttk.Frame(notebook)
-            settings_tab = ttk.Frame(notebook)
-            
-            notebook.add(test_tab, text="Test Mode")
-            notebook.add(settings_tab, text="Settings")
-            
-            ## Create content for test tab
-            self.create_test_tab(test_tab)
-            
-            ## Create content for settings tab
-            self.create_settings_tab(settings_tab)
+            self.show_admin_tabs()
         
         ## Create content for participant tab
         self.create_participant_tab(participant_tab)
@@ -363,13 +454,26 @@ class LauncherApp:
             canvas.itemconfig(canvas_window, width=event.width)
         
         ## Function to handle mousewheel scrolling
+        yview_scroll = canvas.yview_scroll
         def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+            yview_scroll(int(-1 * (event.delta / 120)), "units")
+        
+        ## The wheel handler is only bound while the pointer is over the canvas --> no Python callback for
+        ## wheel events elsewhere in the launcher
+        def _bind_wheel(event):
+            canvas.bind_all("<MouseWheel>", _on_mousewheel)  # Windows and MacOS (with shift)
+        
+        def _unbind_wheel(event):
+            ## Moving onto the widgets inside the canvas also sends <Leave> --> keep the binding then
+            inside = canvas.winfo_containing(event.x_root, event.y_root)
+            if inside is None or not str(inside).startswith(str(canvas)):
+                canvas.unbind_all("<MouseWheel>")
         
         ## Bind events for scrolling
         participant_frame.bind("<Configure>", configure_canvas)
         canvas.bind("<Configure>", lambda e: canvas.itemconfig(canvas_window, width=e.width))
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)  # Windows and MacOS (with shift)
+        canvas.bind("<Enter>", _bind_wheel)
+        canvas.bind("<Leave>", _unbind_wheel)
         
         ## Instructions
         instructions = (
@@ -441,7 +545,7 @@ class LauncherApp:
         verification_code_display.pack(pady=(0, 10))
         
         copy_button = ttk.Button(self.verification_frame, text="Copy Code", 
-                            command=lambda: self.copy_to_clipboard(self.verification_code_var.get()))
+                            command=self._copy_current_code)
         copy_button.pack(pady=(0, 10))
         
         return_instructions = ttk.Label(self.verification_frame, 
@@ -457,10 +561,24 @@ class LauncherApp:
         return participant_frame
     
     def copy_to_clipboard(self, text):
-        ## Copy code to clipboard helper function
+        ## Copy code to clipboard helper function --> the copy itself runs once the current event is handled,
+        ## so clipboard watchers cannot hold up the redraw of the verification frame
+        self.root.after_idle(self._set_clipboard, text)
+        self.status_var.set("Verification code copied to clipboard!")
+    
+    def _set_clipboard(self, text):
         self.root.clipboard_clear()
         self.root.clipboard_append(text)
-        self.status_var.set("Verification code copied to clipboard!")
+    
+    def _copy_current_code(self):
+        ## Copy button callback --> reads the code currently shown
+        self.copy_to_clipboard(self.verification_code_var.get())
+    
+    def _show_verification(self, code):
+        ## Show the verification frame built in create_participant_tab --> packed only if not already mapped
+        self.verification_code_var.set(code)
+        if not self.verification_frame.winfo_manager():
+            self.verification_frame.pack(pady=10)
     
     def check_participant_progress(self):
         ## Check and display participant's progress
@@ -473,17 +591,18 @@ class LauncherApp:
         ## Load completion status
         status = self.load_completion_status(participant_id)
         
-        ## Format progress message
-        completed_count = sum(1 for v in status.values() if v and v != "version_sequence")
-        progress_msg = f"Participant {participant_id} has completed {completed_count-1}/3 game versions.\n\n"
+        ## Format progress message --> only the three version flags count, the sequence entry is not one of them
+        status_get = status.get
+        completed_count = sum(1 for version in ("1", "2", "3") if status_get(version))
+        progress_msg = f"Participant {participant_id} has completed {completed_count}/3 game versions.\n\n"
         
         for version in ["1", "2", "3"]:
             ## Show version number
-            status_text = "✓ Completed" if status.get(version, False) else "❌ Not Completed"
+            status_text = "✓ Completed" if status_get(version, False) else "❌ Not Completed"
             progress_msg += f"Version {version}: {status_text}\n"
         
-        ## Suggest next version --> in sequence
-        next_version = self.get_next_version(participant_id)
+        ## Suggest next version --> in sequence, from the status loaded above
+        next_version = self.get_next_version(participant_id, status)
         if next_version:
             progress_msg += f"\nSuggested next version to play: Version {next_version}"
             self.version_var.set(next_version)
@@ -515,11 +634,10 @@ class LauncherApp:
         condition_label.pack(side=tk.LEFT, padx=(0, 10))
         
         self.condition_var = tk.StringVar()
-        if self.config["conditions"]:
-            self.condition_var.set(self.config["conditions"][0]["description"])
+        if self._cond_descs:
+            self.condition_var.set(self._cond_descs[0])
         
-        condition_options = [cond["description"] for cond in self.config["conditions"]]
-        condition_menu = ttk.Combobox(condition_frame, textvariable=self.condition_var, values=condition_options, state="readonly")
+        condition_menu = ttk.Combobox(condition_frame, textvariable=self.condition_var, values=self._cond_descs, state="readonly")
         condition_menu.pack(side=tk.LEFT)
         
         ## Test Participant ID 
@@ -578,8 +696,7 @@ class LauncherApp:
             return
         
         ## Get the condition for this version --> always use the fixed mapping
-        fixed_sequence = {"1": "random", "2": "rule_based", "3": "ml"}
-        condition = fixed_sequence.get(version, "random")
+        condition = FIXED_SEQUENCE.get(version, "random")
         
         ## Generate code
         code = self.generate_verification_code(pid, version, condition)
@@ -600,7 +717,8 @@ class LauncherApp:
         url_label = ttk.Label(url_frame, text="Qualtrics Survey URL:")
         url_label.pack(anchor=tk.W)
         
-        self.url_var = tk.StringVar(value=self.clean_url(self.config["qualtrics_url"]))
+        ## URLs in the config are already cleaned by load_config/save_settings
+        self.url_var = tk.StringVar(value=self.config.get("qualtrics_url", ""))
         url_entry = ttk.Entry(url_frame, textvariable=self.url_var, width=60)
         url_entry.pack(fill=tk.X, pady=5)
         
@@ -611,7 +729,7 @@ class LauncherApp:
         redirect_label = ttk.Label(redirect_frame, text="Qualtrics Redirect URL:")
         redirect_label.pack(anchor=tk.W)
         
-        self.redirect_var = tk.StringVar(value=self.clean_url(self.config["qualtrics_redirect_url"]))
+        self.redirect_var = tk.StringVar(value=self.config.get("qualtrics_redirect_url", ""))
         redirect_entry = ttk.Entry(redirect_frame, textvariable=self.redirect_var, width=60)
         redirect_entry.pack(fill=tk.X, pady=5)
         
@@ -703,23 +821,45 @@ class LauncherApp:
     def reset_completion_data(self):
         """Reset all completion data (admin function)"""
         if messagebox.askyesno("Confirm Reset", "Are you sure you want to reset ALL participant completion data? This cannot be undone."):
-            completion_path = os.path.join(DATA_FOLDER, COMPLETION_FILE)
-            if os.path.exists(completion_path):
+            if os.path.exists(COMPLETION_PATH):
                 try:
-                    os.remove(completion_path)
+                    os.remove(COMPLETION_PATH)
                     messagebox.showinfo("Reset Complete", "All completion data has been reset.")
                 except Exception as e:
                     messagebox.showerror("Reset Error", f"Could not reset data: {e}")
             else:
                 messagebox.showinfo("Reset Complete", "No completion data to reset.")
     
+    def show_admin_tabs(self):
+        ## Add the test and settings tabs, creating their widgets only the first time
+        if self._admin_tabs is None:
+            test_tab = ttk.Frame(self.notebook)
+            settings_tab = ttk.Frame(self.notebook)
+            
+            self.notebook.add(test_tab, text="Test Mode")
+            self.notebook.add(settings_tab, text="Settings")
+            
+            ## Create content for test tab
+            self.create_test_tab(test_tab)
+            
+            ## Create content for settings tab
+            self.create_settings_tab(settings_tab)
+            
+            self._admin_tabs = (test_tab, settings_tab)
+        else:
+            ## Adding a hidden tab restores it with its earlier options
+            for tab in self._admin_tabs:
+                self.notebook.add(tab)
+    
     def toggle_admin_mode(self, event=None):
         ## Adming mode toggling
-        ## Destroy and recreate the UI with new admin mode
+        ## Show or hide the admin tabs --> the widgets are kept instead of rebuilding the whole UI
         self.admin_mode = not self.admin_mode
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        self.create_widgets()
+        if self.admin_mode:
+            self.show_admin_tabs()
+        else:
+            for tab in self._admin_tabs:
+                self.notebook.hide(tab)
         
         ## Show a subtle indicator when toggling to admin mode
         if self.admin_mode:
@@ -729,19 +869,18 @@ class LauncherApp:
     
     def check_command_line_args(self):
         ## Check if launcher was started with URL parameters
-        if len(sys.argv) > 1 and sys.argv[1].startswith("npcgame://"):
-            self.handle_url_protocol(sys.argv[1])
+        if self._url_arg:
+            self.handle_url_protocol(self._url_arg)
     
     def handle_url_protocol(self, url):
         ## Handle custom URL protocol for launching from Qualtrics --> NOT WORKING
         try:
             ## Parse the URL
-            parsed = urlparse(url)
-            params = parse_qs(parsed.query)
+            params = _parse_npcgame_url(url)
             
             ## Check for participant ID
             if 'pid' in params:
-                participant_id = params['pid'][0]
+                participant_id = params['pid']
                 self.participant_id_var.set(participant_id)
                 
                 ## Automatically check progress
@@ -749,24 +888,22 @@ class LauncherApp:
                 
                 ## Check for version 
                 if 'version' in params:
-                    version = params['version'][0]
-                    if version in ["1", "2", "3"]:
+                    version = params['version']
+                    if version in FIXED_SEQUENCE:
                         self.version_var.set(version)
                 
                 ## Check for condition
                 if 'condition' in params:
-                    condition = params['condition'][0]
+                    condition = params['condition']
                     
                     ## Auto-launch the game with this condition
                     print(f"Auto-launching game for participant {participant_id} with condition {condition}")
                     self.status_var.set(f"Auto-launching: Participant {participant_id}, Condition {condition}")
                     
                     ## Determine which version this corresponds to and set it
-                    fixed_sequence = {"1": "random", "2": "rule_based", "3": "ml"}
-                    for version, cond in fixed_sequence.items():
-                        if cond == condition:
-                            self.version_var.set(version)
-                            break
+                    version = CONDITION_TO_VERSION.get(condition)
+                    if version is not None:
+                        self.version_var.set(version)
                     
                     ## Launch the game
                     self.launch_participant_game(condition)
@@ -779,7 +916,7 @@ class LauncherApp:
     def open_survey(self):
         ## Open the Qualtrics survey in a web browser --> attepmted but does not work, keep as proof of attempt
         try:
-            url = self.clean_url(self.config["qualtrics_url"])
+            url = self.config["qualtrics_url"]
             webbrowser.open(url)
             self.status_var.set(f"Opened survey: {url}")
         except Exception as e:
@@ -787,45 +924,39 @@ class LauncherApp:
     
     def get_condition_system(self, condition_name):
         ## Get the emotion system class for the given condition name
-        for cond in self.config["conditions"]:
-            if cond["name"] == condition_name or cond["description"] == condition_name:
-                system_type = cond["system"]
-                if system_type == EmotionSystem.RANDOM.value:
-                    return RandomEmotionSystem()
-                elif system_type == EmotionSystem.RULE_BASED.value:
-                    return RuleBasedEmotionSystem()
-                elif system_type == EmotionSystem.MACHINE_LEARNING.value:
-                    return MLEmotionSystem()
+        cond = self._cond_lookup.get(condition_name)
+        if cond is not None:
+            system = _make_system(cond["system"])
+            if system is not None:
+                return system
         
         ## Default to random if not found
         print(f"Warning: Condition {condition_name} not found, defaulting to Random")
-        return RandomEmotionSystem()
+        return _make_system(EmotionSystem.RANDOM.value)
     
     def get_condition_for_version(self, version):
         ## Get the condition name for the specified version for this participant
         ## Always use fixed mapping for versions
-        fixed_sequence = {"1": "random", "2": "rule_based", "3": "ml"}
-        return fixed_sequence.get(version, "random")
+        return FIXED_SEQUENCE.get(version, "random")
     
     def show_verification_code(self, participant_id, version, condition):
         ## Show the verification code to the user
         ## Generate the verification code
         code = self.generate_verification_code(participant_id, version, condition)
+        self.display_verification_code(code)
         
-        ## Update the verification code display
-        self.verification_code_var.set(code)
-        
-        ## Show the verification frame
-        self.verification_frame.pack(pady=10)
+        ## Return the code
+        return code
+    
+    def display_verification_code(self, code):
+        ## Update and show the verification frame
+        self._show_verification(code)
         
-        ## Force window to update
-        self.root.update()
+        ## Draw the frame now --> idle tasks only, pending input events stay with the main loop
+        self.root.update_idletasks()
         
         ## Copy to clipboard automatically
         self.copy_to_clipboard(code)
-        
-        ## Return the code
-        return code
     
     def launch_participant_game(self, condition=None):
         ## Launch game for a research participant 
@@ -853,13 +984,11 @@ class LauncherApp:
         ## Run the game !!
         self.status_var.set(f"Launching: Participant {participant_id}, Version {version}")
         
-        try:
-            ## Hide the verification frame if it's visible
+        ## Hide the verification frame if it's visible --> unmapped frames are left alone
+        if self.verification_frame.winfo_manager():
             self.verification_frame.pack_forget()
-            
-            ## Hide the launcher window while the game runs
-            self.root.withdraw()
-            
+        
+        with self._game_session():
             ## Get the emotion system
             emotion_system = self.get_condition_system(condition)
             
@@ -875,6 +1004,12 @@ class LauncherApp:
             ## Run the game and get results
             result = game.run()
             
+            ## Verification code if the game was completed --> stored with the results so the file is written once
+            verification_code = None
+            if result and result.get("completed", False):
+                verification_code = self.generate_verification_code(participant_id, version, condition)
+                result["verification_code"] = verification_code
+            
             ## Save the results to a file
             if result:
                 self.save_results(result)
@@ -885,40 +1020,21 @@ class LauncherApp:
                 ## Update the progress display
                 self.check_participant_progress()
             
-            ## Show the launcher window again so the player can play the next one
-            self.root.deiconify()
-            
-            ## Show verification code if the game was completed
-            if result and result.get("completed", False):
-                ## Show verification code
-                verification_code = self.show_verification_code(participant_id, version, condition)
-                
-                ## Store the verification code in the results file
-                if verification_code:
-                    result["verification_code"] = verification_code
-                    self.save_results(result)
-            
-        except Exception as e:
-            self.root.deiconify()
-            self.status_var.set(f"Error: {e}")
-            messagebox.showerror("Game Error", f"An error occurred: {e}")
-            import traceback
-            traceback.print_exc()
+            ## Show verification code --> visible as soon as the launcher window is back
+            if verification_code:
+                self.display_verification_code(verification_code)
     
     def launch_test_game(self):
         ## Launch game in test mode
         condition = self.condition_var.get()
-        participant_id = self.test_id_var.get().strip() if self.test_id_var.get().strip() else None
+        participant_id = self.test_id_var.get().strip() or None
         
         self.status_var.set(f"Launching test game: {condition}")
         
-        try:
+        with self._game_session():
             ## extract the emotion system
             emotion_system = self.get_condition_system(condition)
             
-            ## Hide the launcher window while the game runs
-            self.root.withdraw()
-            
             ## Create and run the game
             game = Game(
                 emotion_system_instance=emotion_system,
@@ -936,25 +1052,25 @@ class LauncherApp:
                 self.save_results(result)
                 
                 ## Get the version number based on the condition
-                fixed_sequence = {"1": "random", "2": "rule_based", "3": "ml"}
-                version = next(
-                    (ver for ver, cond in fixed_sequence.items() if cond == condition),
-                    "1"  ## Default to random condition
-                )
+                version = CONDITION_TO_VERSION.get(condition, "1")  ## Default to random condition
                 
                 ## Show verification code for testing
                 self.show_verification_code(participant_id, version, condition)
             
-            ## Show the launcher window again
-            self.root.deiconify()
-            
             self.status_var.set("Test game completed")
-            
+    
+    @contextmanager
+    def _game_session(self):
+        ## Hide the launcher while a game runs, bring it back once (also after an error), then report the error
+        try:
+            self.root.withdraw()
+            try:
+                yield
+            finally:
+                self.root.deiconify()
         except Exception as e:
-            self.root.deiconify()
             self.status_var.set(f"Error: {e}")
             messagebox.showerror("Game Error", f"An error occurred: {e}")
-            import traceback
             traceback.print_exc()
     
     def save_results(self, result):
@@ -963,14 +1079,15 @@ class LauncherApp:
             return
         
         try:
-            if not os.path.exists(DATA_FOLDER):
-                os.makedirs(DATA_FOLDER)
+            os.makedirs(DATA_FOLDER, exist_ok=True)
             
             filename = f"result_{result['participant_id']}_{result['condition']}.json"
             filepath = os.path.join(DATA_FOLDER, filename)
             
-            with open(filepath, 'w') as f:
-                json.dump(result, f, indent=4)
+            _atomic_write_text(filepath, json.dumps(result, indent=4))
+            
+            ## Folder mtimes can be coarse (FAT) --> list the folder again on the next check
+            self._result_files_mtime = None
             
             print(f"Results saved to {filepath}")
         except Exception as e:
@@ -988,13 +1105,11 @@ class LauncherApp:
             self.config["verification_salt"] = self.salt_var.get()
             
             ## Fixed version sequence
-            self.config["version_sequence"] = {"1": "random", "2": "rule_based", "3": "ml"}
+            self.config["version_sequence"] = dict(FIXED_SEQUENCE)
             
             ## Save config to file
+            ## --> self.config already holds what was written, no reload from disk
             if self.save_config():
-                ## Reload the configuration to ensure it's updated
-                self.config = self.load_config()
-                
                 self.status_var.set("Settings saved")
                 messagebox.showinfo("Settings", "Settings saved successfully")
             else:
@@ -1015,18 +1130,26 @@ def register_protocol_handler():
             executable = sys.executable
             script = os.path.abspath(sys.argv[0])
             
+            if script.endswith('.py'):
+                ## Running as script
+                cmd = f'"{executable}" "{script}" "%1"'
+            else:
+                ## Running as executable
+                cmd = f'"{script}" "%1"'
+            
+            ## Already registered with this command --> one registry read instead of three writes
+            try:
+                if winreg.QueryValue(winreg.HKEY_CURRENT_USER, r"Software\Classes\npcgame\shell\open\command") == cmd:
+                    return
+            except OSError:
+                pass
+            
             ## Register the protocol
             with winreg.CreateKey(winreg.HKEY_CURRENT_USER, r"Software\Classes\npcgame") as key:
                 winreg.SetValue(key, "", winreg.REG_SZ, "URL:NPC Game Protocol")
                 winreg.SetValueEx(key, "URL Protocol", 0, winreg.REG_SZ, "")
                 
                 with winreg.CreateKey(key, r"shell\open\command") as cmd_key:
-                    if script.endswith('.py'):
-                        ## Running as script
-                        cmd = f'"{executable}" "{script}" "%1"'
-                    else:
-                        ## Running as executable
-                        cmd = f'"{script}" "%1"'
                     winreg.SetValue(cmd_key, "", winreg.REG_SZ, cmd)
             
             print("Protocol handler registered successfully")
@@ -1035,19 +1158,17 @@ def register_protocol_handler():
 
 ## Main function
 def main():
-    ## Check for admin mode flag
-    admin_mode = False
-    if len(sys.argv) > 1 and sys.argv[1] == "--admin":
-        admin_mode = True
-        ## Remove the admin flag so it doesn't interfere with URL handling
-        sys.argv.pop(1)
+    ## Check for admin mode flag and a URL argument --> parsed once here, sys.argv is left untouched
+    args = sys.argv[1:]
+    admin_mode = "--admin" in args
+    url_arg = next((arg for arg in args if arg.startswith("npcgame://")), None)
     
     ## Register protocol handler
     register_protocol_handler()
     
     ## Create and run the launcher app
     root = tk.Tk()
-    app = LauncherApp(root, admin_mode)
+    app = LauncherApp(root, admin_mode, url_arg)
     root.mainloop()
 
 if __name__ == "__main__":